@@ -0,0 +1,108 @@
+"""Benchmark quadkey encoding and decoding.
+
+Compares the table driven quadkey implementations of the tiling
+schemes against the original loops, which do one iteration per zoom
+level, at a handful of zoom levels.
+
+Run with::
+
+    python benchmarks/bench_quadkey.py
+"""
+import random
+import timeit
+
+from tiletanic import Tile
+from tiletanic.tileschemes import DGTiling, WebMercatorBL, qk_regex
+
+ZOOMS = (9, 18, 26)
+NUM_TILES = 10000
+
+
+class LoopDGTiling(DGTiling):
+    """DGTiling with the original per zoom level quadkey loops."""
+    def quadkey(self, *tile):
+        if len(tile) == 1:
+            tile = tile[0]
+        x, y, z  = [int(i) for i in tile]
+
+        quadkey = []
+        for zoom in range(z, 0, -1):
+            digit = 0
+            mask = 1 << (zoom - 1)
+            if int(x) & mask:
+                digit += 1
+            if int(y) & mask:
+                digit += 2
+            quadkey.append(digit)
+        return ''.join(str(d) for d in quadkey)
+
+    def quadkey_to_tile(self, qk):
+        if not qk_regex.match(qk):
+            raise ValueError("Input quadkey is invalid.")
+
+        x = 0
+        y = 0
+        for i, digit in enumerate(reversed(qk)):
+            mask = 1 << i
+            if digit == '1':
+                x = x | mask
+            elif digit == '2':
+                y = y | mask
+            elif digit == '3':
+                x = x | mask
+                y = y | mask
+        return Tile(x, y, len(qk))
+
+
+class LoopWebMercatorBL(WebMercatorBL):
+    """WebMercatorBL with the original per zoom level quadkey loop."""
+    def quadkey(self, *tile):
+        if len(tile) == 1:
+            tile = tile[0]
+        x, y, z  = [int(i) for i in tile]
+
+        quadkey = []
+        for zoom in range(z, 0, -1):
+            digit = 0
+            mask = 1 << (zoom - 1)
+            if int(x) & mask:
+                digit += 1
+            if not (int(y) & mask):
+                digit += 2
+            quadkey.append(digit)
+        return ''.join(str(d) for d in quadkey)
+
+
+def bench(func, args, repeat=7):
+    """Best time per call of func over args, in microseconds."""
+    def run():
+        for a in args:
+            func(a)
+    return min(timeit.repeat(run, number=1, repeat=repeat))/len(args)*1e6
+
+
+def main():
+    rng = random.Random(0)
+    pairs = [('quadkey', LoopDGTiling().quadkey, DGTiling().quadkey),
+             ('quadkey (WebMercatorBL)', LoopWebMercatorBL().quadkey,
+              WebMercatorBL().quadkey),
+             ('quadkey_to_tile', LoopDGTiling().quadkey_to_tile,
+              DGTiling().quadkey_to_tile)]
+
+    print('{:>4}  {:<24} {:>10} {:>10} {:>8}'.format('zoom', 'operation',
+                                                     'loop (us)', 'new (us)',
+                                                     'speedup'))
+    for z in ZOOMS:
+        tiles = [Tile(rng.randrange(2**z), rng.randrange(2**z), z)
+                 for _ in range(NUM_TILES)]
+        qks = [DGTiling().quadkey(t) for t in tiles]
+        for name, loop, new in pairs:
+            args = qks if name == 'quadkey_to_tile' else tiles
+            assert [loop(a) for a in args] == [new(a) for a in args]
+            old_time, new_time = bench(loop, args), bench(new, args)
+            print('{:>4}  {:<24} {:>10.2f} {:>10.2f} {:>7.1f}x'.format(
+                z, name, old_time, new_time, old_time/new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -27,6 +27,7 @@ setup(name='tiletanic',
       zip_safe=False,
       install_requires=['click',
                         'geojson',
+                        'numpy',
                         'shapely>=1.6'],
       entry_points='''
          [console_scripts]
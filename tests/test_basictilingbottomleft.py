@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from tiletanic.tileschemes import BasicTilingBottomLeft
+from tiletanic.tileschemes import quadkey_to_quadint, BasicTilingBottomLeft
 
 @pytest.fixture
 def tiler():
@@ -33,6 +34,17 @@ def test_tile(tiler):
     assert tiler.tile(0.75, 0.75, 1) == (1, 1, 1)
 
 
+def test_tiles(tiler):
+    """Vectorized tile generation matches the scalar version."""
+    xcoords = np.array([0., 0.25, 0.75, 0.25, 0.75, 0.3])
+    ycoords = np.array([0., 0.25, 0.25, 0.75, 0.75, 0.9])
+    for z in range(0, 5):
+        x, y = tiler.tiles(xcoords, ycoords, z)
+        assert x.dtype == np.int64 and y.dtype == np.int64
+        assert [tuple(t) for t in zip(x, y)] == \
+            [tiler.tile(xc, yc, z)[:2] for xc, yc in zip(xcoords, ycoords)]
+
+
 def test_parent(tiler):
     """Parent of a tile."""
     assert tiler.parent(0, 0, 1) == (0, 0, 0)
@@ -96,6 +108,18 @@ def test_bbox(tiler):
     assert tiler.bbox(1, 1, 1) == (0.5, 0.5, 1., 1.)
     
     
+def test_bboxes(tiler):
+    """Vectorized bounding boxes match the scalar version."""
+    tiles = [(0, 0, 1), (1, 0, 1), (3, 2, 2), (405, 184, 9), (13708, 8948, 14)]
+    x, y, z = zip(*tiles)
+    bboxes = tiler.bboxes(x, y, z)
+    assert bboxes.shape == (len(tiles), 4)
+    assert bboxes.tolist() == [list(tiler.bbox(t)) for t in tiles]
+
+    assert tiler.bboxes([2, 3], [1, 1], 2).tolist() == \
+        [list(tiler.bbox(2, 1, 2)), list(tiler.bbox(3, 1, 2))]
+
+
 def test_quadkey(tiler):
     """Tile to quadkey."""
     assert not tiler.quadkey(0, 0, 0)
@@ -116,3 +140,36 @@ def test_quadkey_to_tile2(tiler):
     """Quadkey to tile."""
     assert tiler.quadkey_to_tile('0') == (0, 0, 1)
     assert tiler.quadkey_to_tile('130232101') == (405, 184, 9)
+
+
+def test_quadint(tiler):
+    """Tile to quadint and back."""
+    assert tiler.quadint(0, 0, 0) == 0
+    assert tiler.quadint(0, 0, 1) == quadkey_to_quadint('0')
+    assert tiler.quadint(1, 1, 1) == quadkey_to_quadint('3')
+    assert tiler.quadint(20, 35, 9) == quadkey_to_quadint('000210122')
+
+    for tile in [(0, 0, 0), (1, 0, 1), (20, 35, 9), (405, 184, 9),
+                 (2**29 - 1, 12345, 29)]:
+        assert tiler.quadint_to_tile(tiler.quadint(tile)) == tile
+
+    with pytest.raises(ValueError):
+        tiler.quadint(0, 0, 30)
+    with pytest.raises(ValueError):
+        tiler.quadint_to_tile(63)
+
+
+def test_quadints(tiler):
+    """Vectorized quadints match the scalar version."""
+    tiles = [(0, 0, 0), (1, 0, 1), (20, 35, 9), (405, 184, 9),
+             (2**29 - 1, 12345, 29)]
+    x, y, z = zip(*tiles)
+    qis = tiler.quadints(x, y, z)
+    assert qis.dtype == np.uint64
+    assert qis.tolist() == [tiler.quadint(t) for t in tiles]
+
+    x, y, z = tiler.quadints_to_tiles(qis)
+    assert list(zip(x.tolist(), y.tolist(), z.tolist())) == tiles
+
+    with pytest.raises(ValueError):
+        tiler.quadints_to_tiles([63, 30])
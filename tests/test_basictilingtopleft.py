@@ -1,6 +1,7 @@
+import numpy as np
 import pytest
 
-from tiletanic.tileschemes import BasicTilingTopLeft
+from tiletanic.tileschemes import quadkey_to_quadint, BasicTilingTopLeft
 
 @pytest.fixture
 def tiler():
@@ -44,6 +45,17 @@ def test_tile(tiler):
                       14) == (14228, 9430, 14)
 
 
+def test_tiles(tiler):
+    """Vectorized tile generation matches the scalar version."""
+    xcoords = np.array([0., -15000000., -11271098.4, 13493275.7, 20037508.342789244])
+    ycoords = np.array([0., -15000000., 6261721.4, 1850387.6, -20037508.342789244])
+    for z in range(0, 20):
+        x, y = tiler.tiles(xcoords, ycoords, z)
+        assert x.dtype == np.int64 and y.dtype == np.int64
+        assert [tuple(t) for t in zip(x, y)] == \
+            [tiler.tile(xc, yc, z)[:2] for xc, yc in zip(xcoords, ycoords)]
+
+
 def test_parent(tiler):
     """Parent of a tile."""
     assert tiler.parent(0, 0, 1) == (0, 0, 0)
@@ -119,6 +131,18 @@ def test_bbox(tiler):
     assert tiler.bbox(27685, 19041, 15) == (13821037.70641243, -3250713.9389119744, 13822260.698864993, -3249490.9464594126)
     
     
+def test_bboxes(tiler):
+    """Vectorized bounding boxes match the scalar version."""
+    tiles = [(0, 0, 1), (1, 0, 1), (3, 2, 2), (405, 184, 9), (13708, 8948, 14)]
+    x, y, z = zip(*tiles)
+    bboxes = tiler.bboxes(x, y, z)
+    assert bboxes.shape == (len(tiles), 4)
+    assert bboxes.tolist() == [list(tiler.bbox(t)) for t in tiles]
+
+    assert tiler.bboxes([2, 3], [1, 1], 2).tolist() == \
+        [list(tiler.bbox(2, 1, 2)), list(tiler.bbox(3, 1, 2))]
+
+
 def test_quadkey_to_tile1(tiler):
     """Quadkey to tile exceptions."""
     with pytest.raises(ValueError):
@@ -129,3 +153,31 @@ def test_quadkey_to_tile2(tiler):
     """Quadkey to tile."""
     assert tiler.quadkey_to_tile('0') == (0, 0, 1)
     assert tiler.quadkey_to_tile('130232101') == (405, 184, 9)
+
+
+def test_quadint(tiler):
+    """Tile to quadint and back."""
+    assert tiler.quadint(0, 0, 0) == 0
+    assert tiler.quadint(0, 0, 1) == quadkey_to_quadint('0')
+    assert tiler.quadint(1, 1, 1) == quadkey_to_quadint('3')
+    assert tiler.quadint(20, 35, 9) == quadkey_to_quadint('000210122')
+
+    for tile in [(0, 0, 0), (1, 0, 1), (20, 35, 9), (405, 184, 9),
+                 (2**29 - 1, 12345, 29)]:
+        assert tiler.quadint_to_tile(tiler.quadint(tile)) == tile
+
+    with pytest.raises(ValueError):
+        tiler.quadint(0, 0, 30)
+
+
+def test_quadints(tiler):
+    """Vectorized quadints match the scalar version."""
+    tiles = [(0, 0, 0), (1, 0, 1), (20, 35, 9), (405, 184, 9),
+             (2**29 - 1, 12345, 29)]
+    x, y, z = zip(*tiles)
+    qis = tiler.quadints(x, y, z)
+    assert qis.dtype == np.uint64
+    assert qis.tolist() == [tiler.quadint(t) for t in tiles]
+
+    x, y, z = tiler.quadints_to_tiles(qis)
+    assert list(zip(x.tolist(), y.tolist(), z.tolist())) == tiles
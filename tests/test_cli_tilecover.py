@@ -1,6 +1,11 @@
+import io
+import json
+
+import numpy as np
 from click.testing import CliRunner
 
 from tiletanic import cli
+from tiletanic.tileschemes import DGTiling
 
 def test_cover_geometry_dgtiling_level_9_feature_collection():
     # Wall South Dakota AOI from geojson.io:
@@ -39,3 +44,139 @@ def test_cover_geometry_dgtiling_level_9_adajcent_tiles():
     assert result.exit_code == 0
     assert result.output == "021323303\n021323312\n021323313\n021323321\n021323323\n021323330\n021323331\n021323332\n021323333\n"
 
+
+
+def test_cover_geometry_dgtiling_classify():
+    wall_south_dakota_aoi = '{"geometry":{"coordinates":[[[ -101.953125,43.59375],[-101.953125,44.296875],[-102.65625,44.296875],[-102.65625,43.59375],[-101.953125,43.59375]]],"type":"Polygon"},"type":"Feature"}'
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cover_geometry, ['--classify', '--adjacent', '-'], input=wall_south_dakota_aoi)
+
+    assert result.exit_code == 0
+    assert result.output == "021323303\tboundary\n021323312\tboundary\n021323313\tboundary\n021323321\tboundary\n021323323\tboundary\n021323330\tinterior\n021323331\tboundary\n021323332\tboundary\n021323333\tboundary\n"
+
+
+def test_cover_geometry_dgtiling_seq():
+    wall_south_dakota_aoi = '{"geometry":{"coordinates":[[[ -101.953125,43.59375],[-101.953125,44.296875],[-102.65625,44.296875],[-102.65625,43.59375],[-101.953125,43.59375]]],"type":"Polygon"},"type":"Feature"}'
+    point = '{"geometry":{"coordinates":[-101.9,43.7],"type":"Point"},"type":"Feature","properties":{}}'
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cover_geometry, ['--seq', '-'],
+                           input=wall_south_dakota_aoi + '\n\n\x1e' + point + '\n')
+
+    assert result.exit_code == 0
+    assert result.output == "021323330\n021323331\n"
+
+    result = runner.invoke(cli.cover_geometry, ['--seq', '-'],
+                           input='{"type":"FeatureCollection","features":[]}\n')
+    assert result.exit_code != 0
+
+
+def test_cover_geometry_dgtiling_per_feature():
+    left = '{"geometry":{"coordinates":[[[-102.65625,43.59375],[-102.65625,44.296875],[-101.25,44.296875],[-101.25,43.59375],[-102.65625,43.59375]]],"type":"Polygon"},"type":"Feature","id":"left"}'
+    right = '{"geometry":{"coordinates":[[[-101.953125,43.59375],[-101.953125,44.296875],[-100.546875,44.296875],[-100.546875,43.59375],[-101.953125,43.59375]]],"type":"Polygon"},"type":"Feature"}'
+    collection = '{"type":"FeatureCollection","features":[%s,%s]}' % (left, right)
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cover_geometry, ['--per-feature', '-'], input=collection)
+    assert result.exit_code == 0
+    assert result.output == "021323330\tleft\n021323331\tleft\n021323331\t1\n021332220\t1\n"
+
+    result = runner.invoke(cli.cover_geometry, ['--per-feature', '--dedupe', '-'], input=collection)
+    assert result.exit_code == 0
+    assert result.output == "021323330\tleft\n021323331\tleft\n021332220\t1\n"
+
+    result = runner.invoke(cli.cover_geometry, ['--seq', '--dedupe', '-'], input=left + '\n' + right)
+    assert result.exit_code == 0
+    assert result.output == "021323330\n021323331\n021332220\n"
+
+    result = runner.invoke(cli.cover_geometry, ['--dedupe', '-'], input=collection)
+    assert result.exit_code != 0
+
+
+def test_echo_lines(capsys):
+    assert cli._echo_lines((str(i) for i in range(5)), chunk_size=2) == 5
+    assert capsys.readouterr().out == "0\n1\n2\n3\n4\n"
+    assert cli._echo_lines([]) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_cover_geometry_dgtiling_level_13_streamed():
+    wall_south_dakota_aoi = '{"geometry":{"coordinates":[[[ -101.953125,43.59375],[-101.953125,44.296875],[-102.65625,44.296875],[-102.65625,43.59375],[-101.953125,43.59375]]],"type":"Polygon"},"type":"Feature"}'
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cover_geometry, ['--zoom', '13', '-'], input=wall_south_dakota_aoi)
+
+    assert result.exit_code == 0
+    qks = result.output.splitlines()
+    assert len(qks) == 256
+    assert qks == sorted(qks) and all(qk.startswith("021323330") for qk in qks)
+
+
+def test_cover_geometry_dgtiling_jobs():
+    left = '{"geometry":{"coordinates":[[[-102.65625,43.59375],[-102.65625,44.296875],[-101.25,44.296875],[-101.25,43.59375],[-102.65625,43.59375]]],"type":"Polygon"},"type":"Feature","id":"left"}'
+    right = '{"geometry":{"coordinates":[[[-101.953125,43.59375],[-101.953125,44.296875],[-100.546875,44.296875],[-100.546875,43.59375],[-101.953125,43.59375]]],"type":"Polygon"},"type":"Feature"}'
+    collection = '{"type":"FeatureCollection","features":[%s,%s]}' % (left, right)
+
+    runner = CliRunner()
+    for args in (['--zoom', '13'], ['--zoom', '13', '--adjacent'],
+                 ['--per-feature'], ['--per-feature', '--dedupe', '--classify']):
+        expected = runner.invoke(cli.cover_geometry, args + ['-'], input=collection)
+        result = runner.invoke(cli.cover_geometry, args + ['--jobs', '2', '-'], input=collection)
+        assert result.exit_code == 0
+        assert result.output == expected.output
+
+    result = runner.invoke(cli.cover_geometry, ['--seq', '--jobs', '2', '-'], input=left + '\n' + right)
+    assert result.exit_code == 0
+    assert result.output == "021323330\n021323331\n021323331\n021332220\n"
+
+    result = runner.invoke(cli.cover_geometry, ['--classify', '--jobs', '2', '-'], input=collection)
+    assert result.exit_code != 0
+
+
+def test_cover_geometry_dgtiling_formats():
+    wall_south_dakota_aoi = '{"geometry":{"coordinates":[[[ -101.953125,43.59375],[-101.953125,44.296875],[-102.65625,44.296875],[-102.65625,43.59375],[-101.953125,43.59375]]],"type":"Polygon"},"type":"Feature"}'
+    qks = ["021323303", "021323312", "021323313", "021323321", "021323323",
+           "021323330", "021323331", "021323332", "021323333"]
+    scheme = DGTiling()
+
+    runner = CliRunner()
+    result = runner.invoke(cli.cover_geometry, ['--format', 'zxy', '--adjacent', '-'],
+                           input=wall_south_dakota_aoi)
+    assert result.exit_code == 0
+    assert result.output.splitlines() == \
+        ["{2}/{0}/{1}".format(*scheme.quadkey_to_tile(qk)) for qk in qks]
+
+    result = runner.invoke(cli.cover_geometry, ['--format', 'geojson', '--adjacent', '-'],
+                           input=wall_south_dakota_aoi)
+    assert result.exit_code == 0
+    features = [json.loads(line) for line in result.output.splitlines()]
+    assert [f['properties']['quadkey'] for f in features] == qks
+    assert features[5]['geometry']['coordinates'][0][0] == [-102.65625, 43.59375]
+
+    result = runner.invoke(cli.cover_geometry, ['--format', 'quadint', '--adjacent', '-'],
+                           input=wall_south_dakota_aoi)
+    assert result.exit_code == 0
+    qis = np.frombuffer(result.stdout_bytes, dtype='<u8')
+    assert [scheme.quadkey(scheme.quadint_to_tile(qi)) for qi in qis] == qks
+
+    result = runner.invoke(cli.cover_geometry, ['--format', 'npy', '--adjacent', '-'],
+                           input=wall_south_dakota_aoi)
+    assert result.exit_code == 0
+    assert (np.load(io.BytesIO(result.stdout_bytes)) == qis).all()
+
+    result = runner.invoke(cli.cover_geometry, ['--format', 'quadint', '--classify', '-'],
+                           input=wall_south_dakota_aoi)
+    assert result.exit_code != 0
+
+
+def test_seen_tiles():
+    rng = np.random.default_rng(0)
+    seen = cli._SeenTiles(6, batch_size=8)
+    expected = set()
+    for _ in range(50):
+        tiles = [tuple(xy) + (6,) for xy in rng.integers(0, 16, size=(12, 2)).tolist()]
+        new = seen.add(tiles)
+        for tile, keep in zip(tiles, new):
+            assert keep == (tile not in expected)
+            expected.add(tile)
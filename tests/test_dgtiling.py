@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from tiletanic.tileschemes import DGTiling
@@ -34,6 +35,17 @@ def test_tile(tiler):
     assert tiler.tile(105.1092, 40.1717, 12) == (3243, 1481, 12)
 
 
+def test_tiles(tiler):
+    """Vectorized tile generation matches the scalar version."""
+    xcoords = np.array([0., -90., 90., -135., 45., 105.1092, 180.])
+    ycoords = np.array([0., 0., 0., -45., 45., 40.1717, 90.])
+    for z in range(0, 20):
+        x, y = tiler.tiles(xcoords, ycoords, z)
+        assert x.dtype == np.int64 and y.dtype == np.int64
+        assert [tuple(t) for t in zip(x, y)] == \
+            [tiler.tile(xc, yc, z)[:2] for xc, yc in zip(xcoords, ycoords)]
+
+
 def test_parent(tiler):
     """Parent of a tile."""
     assert tiler.parent(0, 0, 1) == (0, 0, 0)
@@ -114,6 +126,18 @@ def test_bbox(tiler):
     assert tiler.bbox(4, 2, 3) == (0., 0., 45., 45.)
 
     
+def test_bboxes(tiler):
+    """Vectorized bounding boxes match the scalar version."""
+    tiles = [(0, 0, 1), (1, 0, 1), (3, 2, 2), (405, 184, 9), (13708, 8948, 14)]
+    x, y, z = zip(*tiles)
+    bboxes = tiler.bboxes(x, y, z)
+    assert bboxes.shape == (len(tiles), 4)
+    assert bboxes.tolist() == [list(tiler.bbox(t)) for t in tiles]
+
+    assert tiler.bboxes([2, 3], [1, 1], 2).tolist() == \
+        [list(tiler.bbox(2, 1, 2)), list(tiler.bbox(3, 1, 2))]
+
+
 def test_quadkey_to_tile1(tiler):
     """Quadkey to tile exceptions."""
     with pytest.raises(ValueError):
@@ -0,0 +1,33 @@
+import pytest
+
+from tiletanic.tileschemes import quadkey_to_quadint, quadint_to_quadkey
+
+
+def test_quadkey_to_quadint():
+    """Quadkey to quadint conversion."""
+    assert quadkey_to_quadint('') == 0
+    assert quadkey_to_quadint('0') == 1
+    assert quadkey_to_quadint('1') == (1 << 62) | 1
+    assert quadkey_to_quadint('3') == (3 << 62) | 1
+    assert quadkey_to_quadint('03') == (3 << 60) | 2
+
+    with pytest.raises(ValueError):
+        quadkey_to_quadint('4')
+    with pytest.raises(ValueError):
+        quadkey_to_quadint('0' * 30)
+
+
+def test_quadint_round_trip():
+    """Quadints convert back to the quadkeys they came from."""
+    for qk in ['', '0', '3', '000210122', '130232101', '0123' * 7 + '3']:
+        assert quadint_to_quadkey(quadkey_to_quadint(qk)) == qk
+
+    with pytest.raises(ValueError):
+        quadint_to_quadkey(30)
+
+
+def test_quadint_order():
+    """Quadints sort in the same order as their quadkeys."""
+    qks = ['', '0', '00', '000', '001', '01', '1', '10', '2', '3', '33',
+           '0' * 29, '3' * 29, '1' + '0' * 28]
+    assert sorted(qks, key=quadkey_to_quadint) == sorted(qks)
@@ -1,6 +1,14 @@
+import inspect
+import math
+import sys
+import threading
+
 import pytest
-from shapely import geometry
+import shapely
+from shapely import geometry, ops, prepared
 
+from tiletanic import tilecover
+from tiletanic.base import Tile
 from tiletanic.tilecover import cover_geometry
 from tiletanic.tileschemes import DGTiling, WebMercator
 
@@ -87,6 +95,31 @@ def test_cover_geometry_nonshapely_geom(tiler):
             pass
 
 
+def test_cover_geometry_no_zooms(tiler, pt):
+    """At least one zoom level is required."""
+    with pytest.raises(ValueError):
+        for _ in cover_geometry(tiler, pt, []):
+            pass
+
+
+def test_cover_geometry_deep_zoom(tiler):
+    """Covering doesn't recurse, so deep zooms aren't limited by the
+    interpreter's recursion limit."""
+    # A little headroom above however deep the test runner already is,
+    # far less than zoom 50 would need.
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 25)
+    try:
+        tiles = list(cover_geometry(tiler, geometry.Point(-94.4, 15.9), 50))
+        box = geometry.box(-94.4, 15.9, -94.4 + 1e-9, 15.9 + 1e-9)
+        box_tiles = list(cover_geometry(tiler, box, [20, 40]))
+    finally:
+        sys.setrecursionlimit(limit)
+    assert len(tiles) == 1
+    assert tiles[0].z == 50
+    assert box_tiles and all(t.z == 40 for t in box_tiles)
+
+
 def test_cover_geometry_point1(tiler, pt):
     """A Point geometry."""
     tiles = [tile for tile in cover_geometry(tiler, pt, 4)]
@@ -331,3 +364,417 @@ def test_cover_donut_webmercator2(wmtiler, donut):
     assert set(tiles) == set([(4723, 5861, 14), (4723, 5864, 14), (4724, 5862, 14), (4724, 5864, 14), (4725, 5863, 14), (4725, 5864, 14), (18885, 23454, 16),
                               (18886, 23454, 16), (18886, 23455, 16), (18887, 23454, 16), (18887, 23455, 16), (18887, 23456, 16), (18888, 23453, 16), (18888, 23454, 16), (18888, 23455, 16), (18888, 23456, 16), (18888, 23457, 16), (18889, 23449, 16), (18889, 23450, 16), (18889, 23451, 16), (18889, 23452, 16), (18889, 23453, 16), (18889, 23454, 16), (18889, 23455, 16), (18889, 23456, 16), (18889, 23457, 16), (18889, 23458, 16), (18890, 23443, 16), (18890, 23444, 16), (18890, 23445, 16), (18890, 23446, 16), (18890, 23447, 16), (18890, 23448, 16), (18890, 23450, 16), (18890, 23451, 16), (18890, 23452, 16), (18890, 23453, 16), (18890, 23454, 16), (18890, 23455, 16), (18890, 23456, 16), (18890, 23457, 16), (18890, 23458, 16), (18890, 23459, 16), (18891, 23442, 16), (18891, 23443, 16), (18891, 23444, 16), (18891, 23445, 16), (18891, 23446, 16), (18891, 23447, 16), (18891, 23451, 16), (18891, 23452, 16), (18891, 23453, 16), (18891, 23454, 16), (18891, 23455, 16), (18891, 23456, 16), (18891, 23457, 16), (18891, 23458, 16), (18891, 23459, 16), (18891, 23460, 16), (18892, 23442, 16), (18892, 23443, 16), (18892, 23453, 16), (18892, 23454, 16), (18892, 23455, 16), (18892, 23460, 16), (18892, 23461, 16), (18892, 23462, 16), (18893, 23442, 16), (18893, 23443, 16), (18893, 23448, 16), (18893, 23454, 16), (18893, 23455, 16), (18893, 23460, 16), (18893, 23461, 16), (18893, 23462, 16), (18893, 23463, 16), (18894, 23442, 16), (18894, 23443, 16), (18894, 23448, 16), (18894, 23449, 16), (18894, 23455, 16), (18894, 23460, 16), (18894, 23461, 16), (18894, 23462, 16), (18894, 23463, 16), (18894, 23464, 16), (18895, 23443, 16), (18895, 23448, 16), (18895, 23449, 16), (18895, 23450, 16), (18895, 23460, 16), (18895, 23461, 16), (18895, 23462, 16), (18895, 23463, 16), (18895, 23464, 16), (18895, 23465, 16), (18896, 23444, 16), (18896, 23445, 16), (18896, 23446, 16), (18896, 23447, 16), (18896, 23460, 16), (18896, 23461, 16), (18896, 23462, 16), (18896, 23463, 16), (18896, 23464, 16), (18896, 23465, 16), (18897, 23445, 16), (18897, 23446, 16), (18897, 23447, 16), (18897, 23452, 16), (18897, 23453, 16), (18897, 23455, 16), (18897, 23460, 16), (18897, 23461, 16), (18897, 23462, 16), (18897, 23463, 16), (18897, 23464, 16), (18898, 23446, 16), (18898, 23447, 16), (18898, 23452, 16), (18898, 23453, 16), (18898, 23454, 16), (18898, 23455, 16), (18898, 23460, 16), (18898, 23461, 16), (18898, 23462, 16), (18898, 23463, 16), (18899, 23447, 16), (18899, 23452, 16), (18899, 23453, 16), (18899, 23454, 16), (18899, 23455, 16), (18899, 23460, 16), (18899, 23461, 16), (18899, 23462, 16), (18900, 23449, 16), (18900, 23450, 16), (18900, 23451, 16), (18900, 23460, 16), (18900, 23461, 16), (18901, 23450, 16), (18901, 23451, 16), (18901, 23460, 16), (18902, 23451, 16), (18904, 23453, 16), (18904, 23454, 16), (18904, 23455, 16), (18904, 23456, 16), (18904, 23457, 16), (18904, 23458, 16), (18905, 23455, 16), (18905, 23456, 16), (18905, 23457, 16), (18906, 23456, 16),
                               (37769, 46907, 17), (37769, 46908, 17), (37770, 46907, 17), (37771, 46907, 17), (37771, 46910, 17), (37772, 46907, 17), (37773, 46907, 17), (37773, 46912, 17), (37774, 46907, 17), (37774, 46914, 17), (37775, 46907, 17), (37775, 46914, 17), (37775, 46915, 17), (37776, 46916, 17), (37777, 46905, 17), (37777, 46916, 17), (37777, 46917, 17), (37778, 46918, 17), (37779, 46889, 17), (37779, 46890, 17), (37779, 46891, 17), (37779, 46892, 17), (37779, 46893, 17), (37779, 46894, 17), (37779, 46895, 17), (37779, 46896, 17), (37779, 46897, 17), (37779, 46918, 17), (37779, 46919, 17), (37780, 46898, 17), (37780, 46899, 17), (37780, 46920, 17), (37781, 46885, 17), (37781, 46899, 17), (37781, 46920, 17), (37781, 46921, 17), (37782, 46896, 17), (37782, 46897, 17), (37782, 46901, 17), (37782, 46922, 17), (37783, 46896, 17), (37783, 46922, 17), (37783, 46923, 17), (37783, 46924, 17), (37784, 46904, 17), (37784, 46905, 17), (37785, 46883, 17), (37785, 46896, 17), (37785, 46905, 17), (37785, 46926, 17), (37786, 46883, 17), (37786, 46906, 17), (37786, 46907, 17), (37787, 46882, 17), (37787, 46883, 17), (37787, 46898, 17), (37787, 46907, 17), (37787, 46928, 17), (37788, 46882, 17), (37788, 46883, 17), (37788, 46908, 17), (37788, 46909, 17), (37789, 46883, 17), (37789, 46900, 17), (37789, 46901, 17), (37789, 46909, 17), (37789, 46930, 17), (37790, 46884, 17), (37790, 46885, 17), (37790, 46902, 17), (37790, 46911, 17), (37791, 46885, 17), (37791, 46902, 17), (37791, 46903, 17), (37791, 46932, 17), (37792, 46886, 17), (37792, 46887, 17), (37792, 46904, 17), (37792, 46932, 17), (37793, 46904, 17), (37793, 46905, 17), (37793, 46911, 17), (37794, 46889, 17), (37794, 46930, 17), (37795, 46908, 17), (37795, 46909, 17), (37796, 46891, 17), (37796, 46928, 17), (37798, 46893, 17), (37798, 46926, 17), (37798, 46927, 17), (37799, 46926, 17), (37800, 46895, 17), (37800, 46896, 17), (37800, 46897, 17), (37800, 46924, 17), (37800, 46925, 17), (37801, 46897, 17), (37801, 46924, 17), (37802, 46898, 17), (37802, 46899, 17), (37802, 46922, 17), (37802, 46923, 17), (37803, 46899, 17), (37803, 46922, 17), (37804, 46900, 17), (37804, 46901, 17), (37804, 46920, 17), (37804, 46921, 17), (37805, 46901, 17), (37805, 46920, 17), (37806, 46903, 17), (37806, 46920, 17), (37808, 46905, 17), (37808, 46918, 17), (37810, 46908, 17), (37810, 46909, 17), (37810, 46916, 17), (37811, 46909, 17), (37811, 46916, 17), (37812, 46910, 17), (37812, 46911, 17), (37812, 46914, 17), (37812, 46915, 17), (37813, 46911, 17), (37813, 46914, 17), (37814, 46913, 17) ])
+
+
+def test_cover_geometry_unknown_strategy(tiler, poly):
+    """Only known strategies are accepted."""
+    with pytest.raises(ValueError):
+        for _ in cover_geometry(tiler, poly, 7, strategy='sideways'):
+            pass
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometry_breadth_first(tiler, mpt, ls, mls, poly, poly_w_hole, mpoly):
+    """Breadth first covers are identical to depth first ones."""
+    for geom in (mpt, ls, mls, poly, poly_w_hole, mpoly):
+        for zooms in (4, 9, [7, 8], [6, 9, 11], range(12)):
+            assert list(cover_geometry(tiler, geom, zooms, strategy='breadth_first')) == \
+                list(cover_geometry(tiler, geom, zooms))
+
+
+def _concurrent_covers(geom, count=8, **kwargs):
+    """Covers geom from several threads at once, as a service would."""
+    covers = []
+    def cover():
+        covers.append(list(cover_geometry(DGTiling(), geom, 11, **kwargs)))
+    workers = [threading.Thread(target=cover) for _ in range(count)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return covers
+
+
+@pytest.fixture
+def wiggly():
+    return geometry.Polygon([(10 + (15 + math.sin(37 * a)) * math.cos(a),
+                              20 + (15 + math.sin(37 * a)) * math.sin(a))
+                             for a in (i * math.pi / 20000 for i in range(40000))])
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometry_breadth_first_concurrent(wiggly):
+    """Breadth first covers never prepare or test the caller's
+    geometry, so it can be covered from several threads at once."""
+    covers = _concurrent_covers(wiggly, strategy='breadth_first')
+    assert not shapely.is_prepared(wiggly)
+    assert all(cover == covers[0] for cover in covers)
+
+    shapely.prepare(wiggly)
+    covers = _concurrent_covers(wiggly, strategy='breadth_first')
+    assert all(cover == covers[0] for cover in covers)
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometry_rasterize_concurrent(wiggly):
+    """Rasterized covers never run vectorized predicates on the
+    caller's geometry, so it can be covered from several threads at
+    once."""
+    for geom in (wiggly, wiggly.exterior):
+        covers = _concurrent_covers(geom, strategy='rasterize')
+        assert all(cover == covers[0] for cover in covers)
+        assert covers[0] == list(cover_geometry(DGTiling(), geom, 11))
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_donut_webmercator_breadth_first(wmtiler, donut):
+    """Breadth first covers are identical to depth first ones."""
+    for zooms in (16, [14, 16, 17]):
+        assert list(cover_geometry(wmtiler, donut, zooms, strategy='breadth_first')) == \
+            list(cover_geometry(wmtiler, donut, zooms))
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometry_breadth_first_threads(tiler, ls, poly_w_hole, mpoly):
+    """Splitting the predicates between threads changes nothing."""
+    big = geometry.Point(10, 20).buffer(15, 64).difference(geometry.Point(12, 20).buffer(4))
+    for geom in (ls, poly_w_hole, mpoly, big):
+        for zooms in (10, [6, 9, 11]):
+            assert list(cover_geometry(tiler, geom, zooms, strategy='breadth_first', threads=4)) == \
+                list(cover_geometry(tiler, geom, zooms))
+
+
+def test_cover_geometry_simplified(tiler, wmtiler, ls, mls, poly, poly_w_hole, mpoly, donut,
+                                   wiggly):
+    """Covers tested against a simplified boundary are identical to
+    depth first ones."""
+    for geom in (ls, mls, poly, poly_w_hole, mpoly, wiggly):
+        for zooms in (4, 9, 13, [7, 8], [6, 9, 11], range(12)):
+            assert list(cover_geometry(tiler, geom, zooms, strategy='simplified')) == \
+                list(cover_geometry(tiler, geom, zooms))
+    for zooms in (16, [14, 16, 17]):
+        assert list(cover_geometry(wmtiler, donut, zooms, strategy='simplified')) == \
+            list(cover_geometry(wmtiler, donut, zooms))
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometry_breadth_first_threads_concurrent(wiggly):
+    """Threaded covers of one geometry from several callers at once."""
+    covers = _concurrent_covers(wiggly, strategy='breadth_first', threads=2)
+    assert not shapely.is_prepared(wiggly)
+    assert all(cover == covers[0] for cover in covers)
+    assert covers[0] == list(cover_geometry(DGTiling(), wiggly, 11))
+
+
+def test_cover_geometry_threads(tiler, poly):
+    with pytest.raises(ValueError):
+        list(cover_geometry(tiler, poly, 4, strategy='breadth_first', threads=0))
+    with pytest.raises(ValueError):
+        list(cover_geometry(tiler, poly, 4, threads=2))
+
+
+def test_cover_geometry_rasterize(tiler, poly, poly_w_hole, mpoly):
+    """Rasterized polygon covers are identical to depth first ones."""
+    for geom in (poly, poly_w_hole, mpoly):
+        for zooms in (4, 9, 13, [7, 8], [6, 9, 11], range(12)):
+            assert list(cover_geometry(tiler, geom, zooms, strategy='rasterize')) == \
+                list(cover_geometry(tiler, geom, zooms))
+
+
+def test_cover_geometry_rasterize_tile_aligned(tiler, wmtiler):
+    """Polygon edges lying exactly on tile edges."""
+    for scheme in (tiler, wmtiler):
+        geom = geometry.box(*scheme.bbox(3, 2, 3)).union(geometry.box(*scheme.bbox(4, 2, 3)))
+        for zooms in (3, 5, [3, 4, 5]):
+            assert list(cover_geometry(scheme, geom, zooms, strategy='rasterize')) == \
+                list(cover_geometry(scheme, geom, zooms))
+
+    world = geometry.box(-180, -90, 180, 90)
+    assert list(cover_geometry(tiler, world, 3, strategy='rasterize')) == \
+        list(cover_geometry(tiler, world, 3))
+
+
+def test_cover_donut_webmercator_rasterize(wmtiler, donut):
+    """Rasterized polygon covers are identical to depth first ones."""
+    for zooms in (16, [14, 16, 17]):
+        assert list(cover_geometry(wmtiler, donut, zooms, strategy='rasterize')) == \
+            list(cover_geometry(wmtiler, donut, zooms))
+
+
+def test_cover_lines_rasterize(tiler, wmtiler, ls, mls):
+    """Grid walked line covers are identical to depth first ones."""
+    for geom in (ls, mls):
+        for zooms in (4, 9, 13, [7, 8], range(1, 12)):
+            assert list(cover_geometry(tiler, geom, zooms, strategy='rasterize')) == \
+                list(cover_geometry(tiler, geom, zooms))
+
+    # Segments running along tile edges and vertices on tile corners.
+    bbox = wmtiler.bbox(3, 2, 3)
+    geom = geometry.LineString([(bbox.xmin, bbox.ymin), (bbox.xmax, bbox.ymin),
+                                (bbox.xmax, bbox.ymax)])
+    for zooms in (3, 6):
+        assert list(cover_geometry(wmtiler, geom, zooms, strategy='rasterize')) == \
+            list(cover_geometry(wmtiler, geom, zooms))
+
+
+def test_cover_points_match_quadtree(tiler, wmtiler, mpt):
+    """Points mapped straight to tiles agree with the quadtree walk,
+    including points on tile edges and corners."""
+    for scheme in (tiler, wmtiler):
+        bbox = scheme.bbox(5, 3, 4)
+        corners = geometry.MultiPoint([(bbox.xmin, bbox.ymin), (bbox.xmax, bbox.ymin),
+                                       ((bbox.xmin + bbox.xmax)/2, bbox.ymax),
+                                       (scheme.bounds.xmax, scheme.bounds.ymax)])
+        for geom in (mpt, corners):
+            for zoom in (1, 4, 9, 17):
+                assert list(cover_geometry(scheme, geom, zoom)) == \
+                    list(tilecover._cover_geometry(scheme, Tile(0, 0, 0), prepared.prep(geom),
+                                                   geom, {zoom}))
+
+
+def test_cover_points_without_bboxes(tiler, pt, mpt):
+    """Schemes without the vectorized bboxes() still cover points."""
+    class BasicScheme(object):
+        def bbox(self, *tile):
+            return tiler.bbox(*tile)
+
+        def children(self, *tile):
+            return tiler.children(*tile)
+
+    for geom in (pt, mpt):
+        for zooms in (0, 4, [3, 9]):
+            assert list(cover_geometry(BasicScheme(), geom, zooms)) == \
+                list(cover_geometry(tiler, geom, zooms))
+
+
+def test_cover_geometry_ranges(tiler, pt, ls, poly, poly_w_hole, mpoly):
+    """Expanded runs hold the same tiles as the cover, row by row."""
+    for geom in (pt, ls, poly, poly_w_hole, mpoly):
+        for zoom in (0, 4, 9):
+            ranges = tilecover.cover_geometry_ranges(tiler, geom, zoom)
+            assert ranges.zoom == zoom
+            assert (ranges.starts < ranges.stops).all()
+            assert list(tilecover.expand_ranges(ranges)) == \
+                sorted(cover_geometry(tiler, geom, zoom), key=lambda t: (t.y, t.x))
+
+    ranges = tilecover.cover_geometry_ranges(tiler, geometry.box(*tiler.bbox(1, 0, 2)), 3)
+    assert ranges.rows.tolist() == [0, 1, 2]
+    assert ranges.starts.tolist() == [1, 1, 1]
+    assert ranges.stops.tolist() == [5, 5, 5]
+
+
+def test_cover_geometry_ranges_empty(tiler):
+    ranges = tilecover.cover_geometry_ranges(tiler, geometry.Polygon(), 5)
+    assert len(ranges.rows) == len(ranges.starts) == len(ranges.stops) == 0
+    assert list(tilecover.expand_ranges(ranges)) == []
+
+
+def test_parallel_cover_geometry(tiler, pt, ls, poly, mpoly):
+    """Parallel covers are identical to serial ones."""
+    for geom in (pt, ls, poly, mpoly):
+        for zooms in (4, [3, 9], range(10)):
+            assert list(tilecover.parallel_cover_geometry(tiler, geom, zooms, workers=2)) == \
+                list(cover_geometry(tiler, geom, zooms))
+
+
+def test_parallel_cover_geometry_not_adjacent(tiler, ls, poly, mpoly):
+    """Tiles only touching the geometry are left out, as a serial
+    cover followed by a touches() filter would."""
+    aligned = geometry.box(*tiler.bbox(55, 47, 8))
+    for geom in (ls, poly, mpoly, aligned):
+        prep_geom = prepared.prep(geom)
+        for zooms in (9, [3, 9]):
+            expected = [tile for tile in cover_geometry(tiler, geom, zooms)
+                        if not prep_geom.touches(geometry.box(*tiler.bbox(tile)))]
+            for workers in (1, 2):
+                assert list(tilecover.parallel_cover_geometry(
+                    tiler, geom, zooms, workers=workers, adjacent=False)) == expected
+
+
+def test_parallel_cover_geometry_workers(tiler, poly):
+    with pytest.raises(ValueError):
+        list(tilecover.parallel_cover_geometry(tiler, poly, 4, workers=0))
+    assert list(tilecover.parallel_cover_geometry(tiler, poly, 4, workers=1)) == \
+        list(cover_geometry(tiler, poly, 4))
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometries(tiler, pt, mpt, ls, mls, poly, poly_w_hole, mpoly):
+    """Each geometry gets the tiles cover_geometry gives it."""
+    geoms = [poly, pt, geometry.Polygon(), mls, mpoly, ls, poly_w_hole, mpt, poly]
+    for zooms in (4, 9, [7, 8], [6, 9, 11], range(10)):
+        pairs = list(tilecover.cover_geometries(tiler, geoms, zooms))
+        assert [i for i, _ in pairs] == sorted(i for i, _ in pairs)
+        for i, geom in enumerate(geoms):
+            assert [tile for j, tile in pairs if j == i] == \
+                list(cover_geometry(tiler, geom, zooms))
+
+    # The caller's geometries are left unprepared.
+    geoms = [geometry.Point(0, 0).buffer(5), geometry.LineString([(0, 0), (9, 9)])]
+    list(tilecover.cover_geometries(tiler, geoms, 6))
+    assert not shapely.is_prepared(geoms).any()
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_cover_geometries_bad_input(tiler, poly):
+    assert list(tilecover.cover_geometries(tiler, [], 4)) == []
+    with pytest.raises(ValueError):
+        list(tilecover.cover_geometries(tiler, [poly, 'POINT (0 0)'], 4))
+    with pytest.raises(ValueError):
+        list(tilecover.cover_geometries(tiler, [poly], []))
+
+
+def test_tile_cover(tiler, ls, poly, poly_w_hole):
+    """TileCovers hold the same tiles as the covers they come from."""
+    for geom in (ls, poly, poly_w_hole):
+        for zoom in (0, 4, 9):
+            tiles = list(cover_geometry(tiler, geom, zoom))
+            cover = tilecover.TileCover.from_geometry(tiler, geom, zoom)
+            assert list(cover) == tiles
+            assert len(cover) == len(tiles)
+            assert all(tile in cover for tile in tiles)
+            assert cover == tilecover.TileCover.from_tiles(tiles, zoom)
+
+
+def test_tile_cover_contains():
+    cover = tilecover.TileCover.from_tiles([Tile(1, 0, 1), Tile(4, 4, 3)])
+    assert cover.zoom == 3
+    assert len(cover) == 17
+    assert Tile(1, 0, 1) in cover
+    assert Tile(5, 2, 3) in cover
+    assert Tile(11, 5, 4) in cover
+    assert Tile(4, 4, 3) in cover
+    assert Tile(2, 2, 2) not in cover
+    assert Tile(0, 0, 0) not in cover
+    assert Tile(3, 3, 3) not in cover
+
+    with pytest.raises(ValueError):
+        tilecover.TileCover.from_tiles([Tile(1, 0, 4)], 3)
+
+
+def test_tile_cover_set_algebra(tiler, poly, mpoly):
+    a, b = set(cover_geometry(tiler, poly, 9)), set(cover_geometry(tiler, mpoly, 8))
+    b = {child for tile in b for child in tiler.children(tile)}
+    cover_a = tilecover.TileCover.from_geometry(tiler, poly, 9)
+    cover_b = tilecover.TileCover.from_geometry(tiler, mpoly, 8)
+    assert set(cover_a | cover_b) == a | b
+    assert set(cover_a & cover_b) == a & b
+    assert set(cover_a - cover_b) == a - b
+    assert set(cover_b - cover_a) == b - a
+    assert (cover_a | cover_b).zoom == 9
+
+
+def test_tile_cover_to_zoom(tiler, poly):
+    cover = tilecover.TileCover.from_geometry(tiler, poly, 9)
+    assert set(cover.to_zoom(6)) == set(cover_geometry(tiler, poly, 6))
+    assert cover.to_zoom(11).to_zoom(9) == cover
+    assert len(cover.to_zoom(11)) == 16*len(cover)
+
+
+def test_estimate_cover_count(tiler, pt, ls, poly, poly_w_hole, mpoly):
+    for geom in (pt, ls, poly, poly_w_hole, mpoly):
+        for zoom in (0, 4, 9, 12):
+            count = len(list(cover_geometry(tiler, geom, zoom)))
+            assert tilecover.estimate_cover_count(tiler, geom, zoom) == (count, count)
+
+    assert tilecover.estimate_cover_count(tiler, geometry.Polygon(), 4) == (0, 0)
+
+
+@pytest.mark.skipif(not tilecover._SHAPELY2, reason="requires shapely 2")
+def test_estimate_cover_count_bounded(tiler, poly):
+    count = len(list(cover_geometry(tiler, poly, 12)))
+    low, high = tilecover.estimate_cover_count(tiler, poly, 12, max_tiles=5)
+    assert low <= count <= high
+    assert low < high
+
+    geom = geometry.Point(0, 0).buffer(5)
+    tilecover.estimate_cover_count(tiler, geom, 12, max_tiles=5)
+    assert not shapely.is_prepared(geom)
+
+
+def test_cover_geometry_blocks(tiler, pt, ls, poly, poly_w_hole, mpoly):
+    """Expanded blocks are exactly the cover."""
+    def expand(block):
+        tiles = [block.tile]
+        while tiles[0].z < block.zoom:
+            tiles = [child for tile in tiles for child in tiler.children(tile)]
+        return tiles
+
+    for geom in (pt, ls, poly, poly_w_hole, mpoly):
+        for zooms in (4, 12, [7, 8], [6, 9, 11], range(12)):
+            tiles = list(cover_geometry(tiler, geom, zooms))
+            blocks = list(tilecover.cover_geometry_blocks(tiler, geom, zooms))
+            assert [tile for block in blocks for tile in expand(block)] == tiles
+            assert tilecover.cover_geometry_count(tiler, geom, zooms) == len(tiles)
+
+
+def test_cover_geometry_blocks_interior(tiler):
+    geom = geometry.box(*tiler.bbox(4, 2, 3))
+    blocks = list(tilecover.cover_geometry_blocks(tiler, geom.buffer(1e-9), [3, 10]))
+    assert tilecover.TileBlock(Tile(4, 2, 3), 3) in blocks
+    assert tilecover.cover_geometry_count(tiler, geom, 10) == \
+        len(list(cover_geometry(tiler, geom, 10)))
+    assert any(block.zoom == 10 and block.tile.z < 10
+               for block in tilecover.cover_geometry_blocks(tiler, geom, 10))
+
+
+def test_adaptive_cover_geometry(tiler, ls, poly, mpoly):
+    for geom in (ls, poly, mpoly):
+        for max_tiles in (8, 40, 200):
+            tiles = list(tilecover.adaptive_cover_geometry(tiler, geom, max_tiles, 3, 12))
+            assert 0 < len(tiles) <= max_tiles
+            assert len(set(tiles)) == len(tiles)
+            assert all(3 <= tile.z <= 12 for tile in tiles)
+
+            # The tiles cover the geometry without overlapping.
+            boxes = [geometry.box(*tiler.bbox(tile)) for tile in tiles]
+            union = ops.unary_union(boxes)
+            assert union.buffer(1e-9).contains(geom)
+            assert union.area == pytest.approx(sum(box.area for box in boxes))
+
+
+def test_adaptive_cover_geometry_budget(tiler, poly):
+    # With room to spare, the cover is as tight as the finest zoom allows.
+    tiles = list(tilecover.adaptive_cover_geometry(tiler, poly, 10000, 3, 8))
+    while any(tile.z < 8 for tile in tiles):
+        tiles = [child for tile in tiles
+                 for child in (tiler.children(tile) if tile.z < 8 else [tile])]
+    assert sorted(tiles) == sorted(cover_geometry(tiler, poly, 8))
+    with pytest.raises(ValueError):
+        list(tilecover.adaptive_cover_geometry(tiler, poly, 1, 9, 12))
+
+
+def test_cover_geometry_classify(tiler, pt, ls, poly, poly_w_hole, mpoly):
+    """Tiles are labelled interior exactly when the geometry contains them."""
+    for geom in (pt, ls, poly, poly_w_hole, mpoly):
+        prep_geom = prepared.prep(geom)
+        for zooms in (4, 9, [7, 8], [6, 9, 11], range(10)):
+            classified = list(cover_geometry(tiler, geom, zooms, classify=True))
+            assert [tile for tile, _ in classified] == list(cover_geometry(tiler, geom, zooms))
+            for tile, label in classified:
+                inside = prep_geom.contains(geometry.box(*tiler.bbox(tile)))
+                assert label == (tilecover.INTERIOR if inside else tilecover.BOUNDARY)
+
+    with pytest.raises(ValueError):
+        list(cover_geometry(tiler, poly, 4, strategy='rasterize', classify=True))
+
+
+def test_clip_to_tiles(tiler, pt, ls, poly, poly_w_hole, mpoly):
+    """Pieces match clipping the whole geometry to each covering tile."""
+    for geom in (pt, ls, poly, poly_w_hole, mpoly):
+        for zoom in (0, 4, 9):
+            clipped = list(tilecover.clip_to_tiles(tiler, geom, zoom))
+            assert [tile for tile, _ in clipped] == list(cover_geometry(tiler, geom, zoom))
+            for tile, piece in clipped:
+                expected = geom.intersection(geometry.box(*tiler.bbox(tile)))
+                assert piece.geom_type == expected.geom_type
+                assert piece.symmetric_difference(expected).area == pytest.approx(0, abs=1e-12)
+                assert piece.length == pytest.approx(expected.length)
+
+    assert list(tilecover.clip_to_tiles(tiler, geometry.Polygon(), 4)) == []
+
+
+def test_clip_to_tiles_interior(tiler):
+    geom = geometry.box(*tiler.bbox(4, 2, 3))
+    pieces = dict(tilecover.clip_to_tiles(tiler, geom, 5))
+    assert pieces[Tile(17, 9, 5)].equals(geometry.box(*tiler.bbox(17, 9, 5)))
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from tiletanic.tileschemes import UTM10kmTiling
@@ -27,6 +28,17 @@ def test_tile(tiler):
     assert tiler.tile(500_000, 5_000, z) == (2**z // 2, 2**z // 2 - 1, z)
     assert tiler.tile(500_000, -10_000, z) == (2**z // 2, 2**z // 2 + 1, z)    
 
+def test_tiles(tiler):
+    """Vectorized tile generation matches the scalar version."""
+    xcoords = np.array([500_000., 495_000., 510_000., 166_021.4, 833_978.6])
+    ycoords = np.array([0., 5_000., -10_000., 9_329_005.2, -1_000.])
+    for z in range(0, 19):
+        x, y = tiler.tiles(xcoords, ycoords, z)
+        assert x.dtype == np.int64 and y.dtype == np.int64
+        assert [tuple(t) for t in zip(x, y)] == \
+            [tiler.tile(xc, yc, z)[:2] for xc, yc in zip(xcoords, ycoords)]
+
+
 def test_parent(tiler):
     """Parent of a tile."""
     assert tiler.parent(0, 0, 1) == (0, 0, 0)
@@ -108,6 +120,19 @@ def test_bbox(tiler):
     z = 8
     assert tiler.bbox(2**z // 2, 2**z // 2 - 1, z) == (500000, 0, 580000, 80000)
 
+
+def test_bboxes(tiler):
+    """Vectorized bounding boxes match the scalar version."""
+    tiles = [(0, 0, 1), (1, 0, 1), (3, 2, 2), (405, 184, 9), (13708, 8948, 14)]
+    x, y, z = zip(*tiles)
+    bboxes = tiler.bboxes(x, y, z)
+    assert bboxes.shape == (len(tiles), 4)
+    assert bboxes.tolist() == [list(tiler.bbox(t)) for t in tiles]
+
+    assert tiler.bboxes([2, 3], [1, 1], 2).tolist() == \
+        [list(tiler.bbox(2, 1, 2)), list(tiler.bbox(3, 1, 2))]
+
+
 def test_quadkey_to_tile1(tiler):
     """Quadkey to tile exceptions."""
     with pytest.raises(ValueError):
@@ -2,9 +2,10 @@
 
 http://www.maptiler.org/google-maps-coordinates-tile-bounds-projection/
 """
+import numpy as np
 import pytest
 
-from tiletanic.tileschemes import WebMercatorBL
+from tiletanic.tileschemes import WebMercatorBL, quadkey_to_quadint
 
 @pytest.fixture
 def tiler():
@@ -36,6 +37,17 @@ def test_tile(tiler):
                       14) == (13708, 8948, 14)
 
 
+def test_tiles(tiler):
+    """Vectorized tile generation matches the scalar version."""
+    xcoords = np.array([0., -15000000., -11271098.4, 13493275.7, 20037508.342789244])
+    ycoords = np.array([0., -15000000., 6261721.4, 1850387.6, -20037508.342789244])
+    for z in range(0, 20):
+        x, y = tiler.tiles(xcoords, ycoords, z)
+        assert x.dtype == np.int64 and y.dtype == np.int64
+        assert [tuple(t) for t in zip(x, y)] == \
+            [tiler.tile(xc, yc, z)[:2] for xc, yc in zip(xcoords, ycoords)]
+
+
 def test_parent(tiler):
     """Parent of a tile."""
     assert tiler.parent(0, 0, 1) == (0, 0, 0)
@@ -112,6 +124,18 @@ def test_bbox(tiler):
                                    
 
     
+def test_bboxes(tiler):
+    """Vectorized bounding boxes match the scalar version."""
+    tiles = [(0, 0, 1), (1, 0, 1), (3, 2, 2), (405, 184, 9), (13708, 8948, 14)]
+    x, y, z = zip(*tiles)
+    bboxes = tiler.bboxes(x, y, z)
+    assert bboxes.shape == (len(tiles), 4)
+    assert bboxes.tolist() == [list(tiler.bbox(t)) for t in tiles]
+
+    assert tiler.bboxes([2, 3], [1, 1], 2).tolist() == \
+        [list(tiler.bbox(2, 1, 2)), list(tiler.bbox(3, 1, 2))]
+
+
 def test_quadkey(tiler):
     """Tile to quadkey."""
     assert not tiler.quadkey(0, 0, 0)
@@ -136,3 +160,22 @@ def test_quadkey_to_tile2(tiler):
     assert tiler.quadkey_to_tile('130232101') == (405, 327, 9)
     assert tiler.quadkey_to_tile('130200112223222222') == (199744, 179200, 18)
     assert tiler.quadkey_to_tile('210320300233121201') == (84201, 103979, 18)
+
+
+def test_quadint(tiler):
+    """Quadints follow the quadkeys, which count rows from the top."""
+    for tile in [(0, 0, 0), (0, 0, 1), (0, 1, 1), (3, 10, 4),
+                 (13708, 8948, 14)]:
+        assert tiler.quadint(tile) == quadkey_to_quadint(tiler.quadkey(tile))
+        assert tiler.quadint_to_tile(tiler.quadint(tile)) == tile
+
+
+def test_quadints(tiler):
+    """Vectorized quadints match the scalar version."""
+    tiles = [(0, 0, 0), (0, 0, 1), (0, 1, 1), (3, 10, 4), (13708, 8948, 14)]
+    x, y, z = zip(*tiles)
+    qis = tiler.quadints(x, y, z)
+    assert qis.tolist() == [tiler.quadint(t) for t in tiles]
+
+    x, y, z = tiler.quadints_to_tiles(qis)
+    assert list(zip(x.tolist(), y.tolist(), z.tolist())) == tiles
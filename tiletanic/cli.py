@@ -2,8 +2,14 @@
 # Add click tests
 # Add documentation - how to run with a file vs stdout, document arguments, etc.
 
+import collections
+import io
+import itertools
+from concurrent import futures
+
 import click
 import geojson
+import numpy as np
 from shapely import geometry, ops, prepared
 import tiletanic
 
@@ -28,15 +34,49 @@ def cli():
                     "points. Default=do not include adjacent tiles")
 @click.option('--quadkey/--no-quadkey', default=True,
               help="Output option to prints the quadkeys of the tile "
-                   "covering generated. Default prints quadkeys")
-def cover_geometry(tilescheme, aoi_geojson, zoom, adjacent, quadkey):
+                   "covering generated, or the tiles in the --format "
+                   "chosen. Default prints quadkeys")
+@click.option('--format', 'fmt', default='quadkey',
+              type=click.Choice(['quadkey', 'zxy', 'geojson', 'quadint', 'npy']),
+              help="Output format: quadkey lines, z/x/y lines, one "
+                   "GeoJSON Feature per tile and line, raw little-endian "
+                   "uint64 quadints, or a NumPy .npy array of quadints. "
+                   "The binary formats can't be combined with --classify "
+                   "or --per-feature. Default=quadkey")
+@click.option('--classify/--no-classify', default=False,
+              help="Follow each quadkey with a tab and 'interior' if the "
+                   "tile lies completely within AOI_GEOJSON or 'boundary' "
+                   "if it doesn't. Default=quadkeys only")
+@click.option('--seq/--no-seq', default=False,
+              help="Read AOI_GEOJSON as a sequence of Features, one per "
+                   "line (newline delimited GeoJSON or GeoJSONSeq), and "
+                   "cover each one as it is read. Default=read a single "
+                   "Feature or FeatureCollection")
+@click.option('--per-feature/--no-per-feature', default=False,
+              help="Cover each Feature of AOI_GEOJSON separately instead "
+                   "of merging them, and follow each quadkey with a tab "
+                   "and the Feature's id, or its index if it has none. "
+                   "Default=merge the Features")
+@click.option('--dedupe/--no-dedupe', default=False,
+              help="With --seq or --per-feature, print each tile only "
+                   "once, for the first Feature that covers it. "
+                   "Default=print tiles once per Feature")
+@click.option('--jobs', default=1, type=click.IntRange(1, None),
+              help="Number of worker processes.  With --seq or "
+                   "--per-feature the Features are shared out between "
+                   "them, otherwise the quadtree below the AOI is, "
+                   "which can't be done with --classify. The output is "
+                   "the same, in the same order. Default=1")
+def cover_geometry(tilescheme, aoi_geojson, zoom, adjacent, quadkey, fmt, classify, seq,
+                   per_feature, dedupe, jobs):
     """Calculate a tile covering for an input AOI_GEOJSON at a particular
     ZOOM level using the given TILESCHEME.
 
     AOI_GEOJSON - Area of Interest which needs to be chopped into a
     tile covering encoded as GeoJSON.  Should be either a single
     Feature or a FeatureCollection.  Read in from positional argument
-    or stdin.
+    or stdin.  With --seq, it should instead hold one Feature per
+    line, and each one is covered and printed as soon as it is read.
 
     Example with geojson file input:
 
@@ -74,31 +114,322 @@ def cover_geometry(tilescheme, aoi_geojson, zoom, adjacent, quadkey):
     else:
         raise ValueError("tilescheme '{}' is unsupported.").format(tilescheme)
 
+    binary = fmt in ('quadint', 'npy')
+    if binary and (classify or per_feature):
+        raise click.UsageError("--format {} holds nothing but tiles, it can't be "
+                               "used with --classify or --per-feature".format(fmt))
+    if dedupe and not (seq or per_feature):
+        raise click.UsageError("--dedupe needs --seq or --per-feature, a merged "
+                               "AOI's tiles are never repeated")
+    if jobs > 1 and classify and not (seq or per_feature):
+        raise click.UsageError("--jobs can only split up a single AOI's cover "
+                               "without --classify")
+
+    if seq:
+        geoms = _feature_geoms(_read_features(aoi_geojson))
+    else:
+        aoi = _read_aoi(aoi_geojson)
+        if per_feature:
+            geoms = _feature_geoms(aoi['features'] if aoi['type'] == 'FeatureCollection'
+                                   else [aoi])
+        elif aoi['type'] == 'FeatureCollection':
+            geoms = [(None, ops.unary_union([geometry.shape(f['geometry'])
+                                             for f in aoi['features']
+                                             if f['geometry']['type'].endswith('Polygon')]))]
+        else:
+            geoms = [(None, geometry.shape(aoi['geometry']))]
+
+    if jobs > 1 and (seq or per_feature):
+        covers = _parallel_covers(scheme, geoms, zoom, adjacent, classify, jobs)
+    else:
+        covers = ((fid, _cover_tiles(scheme, geom, zoom, adjacent, classify, jobs))
+                  for fid, geom in geoms)
+
+    seen = _SeenTiles(zoom)
+    chunks = []
+    for fid, tiles in covers:
+        if dedupe:
+            tiles = list(tiles)
+            new = seen.add([t[0] if classify else t for t in tiles])
+            tiles = [t for t, keep in zip(tiles, new) if keep]
+
+        if not quadkey:
+            continue
+        if fmt == 'quadint':
+            for qis in _quadint_chunks(scheme, tiles):
+                click.echo(qis.astype('<u8').tobytes(), nl=False)
+        elif fmt == 'npy':
+            # The .npy header holds the length, so nothing can be
+            # written until every cover is found.
+            chunks.extend(_quadint_chunks(scheme, tiles))
+        else:
+            lines = _format_lines(scheme, tiles, fmt, fid if per_feature else None, classify)
+            if not _echo_lines(lines) and fid is None and fmt == 'quadkey':
+                click.echo("")
+
+    if quadkey and fmt == 'npy':
+        qis = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint64)
+        out = io.BytesIO()
+        np.save(out, qis.astype('<u8'))
+        click.echo(out.getvalue(), nl=False)
+
+
+def _format_lines(tilescheme, tiles, fmt, fid=None, classify=False):
+    """Formats tiles as lines of text.
+
+    Args:
+      tilescheme: The tile scheme to use.
+      tiles: Iterable of tiles, or of (tile, label) tuples if
+             classify is set.
+      fmt: 'quadkey', 'zxy' or 'geojson'.
+      fid: Feature id to add to each line, if any.
+      classify: tiles holds (tile, label) tuples.
+
+    Yields:
+      One line per tile.  The quadkey and z/x/y formats follow the
+      tile with tab separated fields for the id and label, GeoJSON
+      puts them in the Feature's properties.
+    """
+    for t in tiles:
+        t, label = t if classify else (t, None)
+        if fmt == 'geojson':
+            bbox = tilescheme.bbox(t)
+            properties = {'quadkey': tilescheme.quadkey(t)}
+            if fid is not None:
+                properties['id'] = fid
+            if label is not None:
+                properties['label'] = label
+            yield geojson.dumps(geojson.Feature(
+                geometry=geojson.Polygon([[(bbox.xmin, bbox.ymin), (bbox.xmax, bbox.ymin),
+                                           (bbox.xmax, bbox.ymax), (bbox.xmin, bbox.ymax),
+                                           (bbox.xmin, bbox.ymin)]]),
+                properties=properties))
+        else:
+            if fmt == 'zxy':
+                fields = ["{}/{}/{}".format(t[2], t[0], t[1])]
+            else:
+                fields = [tilescheme.quadkey(t)]
+            if fid is not None:
+                fields.append(str(fid))
+            if label is not None:
+                fields.append(label)
+            yield "\t".join(fields)
+
+
+def _quadint_chunks(tilescheme, tiles, chunk_size=65536):
+    """Packs tiles into quadints a chunk at a time.
+
+    Args:
+      tilescheme: The tile scheme to use.
+      tiles: Iterable of tiles.
+      chunk_size: The number of tiles to pack at once.
+
+    Yields:
+      uint64 NumPy arrays of quadints.
+    """
+    tiles = iter(tiles)
+    while True:
+        chunk = np.array(list(itertools.islice(tiles, chunk_size)),
+                         dtype=np.int64).reshape(-1, 3)
+        if not len(chunk):
+            return
+        yield tilescheme.quadints(chunk[:, 0], chunk[:, 1], chunk[:, 2])
+
+
+class _SeenTiles(object):
+    """The tiles already printed, for --dedupe.
+
+    Most of them are kept as sorted runs of Morton codes in a
+    TileCover and looked up with a binary search.  The latest ones
+    are kept in a set and only merged into the runs once there are
+    as many of them as there are runs, so the merges cost no more
+    than the lookups however many Features there are.
+
+    Args:
+      zoom: The zoom level of the tiles.
+      batch_size: The fewest new tiles to merge into the runs at once.
+    """
+    def __init__(self, zoom, batch_size=65536):
+        self.zoom = zoom
+        self.batch_size = batch_size
+        self.cover = tiletanic.tilecover.TileCover([], [], zoom)
+        self.batch = set()
+
+    def add(self, tiles):
+        """Adds tiles, noting which of them hadn't been seen before.
+
+        Args:
+          tiles: List of tiles at the zoom level.
+
+        Returns:
+          A list of booleans, True for the tiles not seen before
+          (including earlier in tiles).
+        """
+        xy = np.array([(t[0], t[1]) for t in tiles], dtype=np.uint64).reshape(-1, 2)
+        codes = tiletanic.tileschemes._interleave(xy[:, 0], xy[:, 1]).astype(np.int64)
+        starts, stops = self.cover.starts, self.cover.stops
+        run = np.searchsorted(stops, codes, side='right')
+        old = run < len(stops)
+        old[old] = starts[run[old]] <= codes[old]
+
+        new = []
+        for code, was_seen in zip(codes.tolist(), old.tolist()):
+            keep = not was_seen and code not in self.batch
+            if keep:
+                self.batch.add(code)
+            new.append(keep)
+
+        if len(self.batch) >= max(self.batch_size, len(starts)):
+            batch = np.fromiter(self.batch, dtype=np.int64, count=len(self.batch))
+            self.cover = self.cover | tiletanic.tilecover.TileCover(batch, batch + 1, self.zoom)
+            self.batch = set()
+        return new
+
+
+def _cover_tiles(tilescheme, geom, zoom, adjacent, classify, jobs=1):
+    """Covers one geometry the way the cover_geometry command asks.
+
+    Args:
+      tilescheme: The tile scheme to use.
+      geom: Shapely Geometry area of interest
+      zoom: The zoom level of the tiles.
+      adjacent: Keep the tiles that only touch geom.
+      classify: Yield (tile, label) tuples rather than bare tiles.
+      jobs: The number of worker processes to split the quadtree
+            between, which also leave out the adjacent tiles.  Not
+            used for classified covers, which are always found in
+            this process.
+
+    Returns:
+      An iterator of the tiles, streamed as they are found.
+    """
+    if jobs > 1 and not classify:
+        return tiletanic.tilecover.parallel_cover_geometry(tilescheme, geom, zoom,
+                                                          workers=jobs, adjacent=adjacent)
+
+    tiles = tiletanic.tilecover.cover_geometry(tilescheme, geom, zoom, classify=classify)
+    if not adjacent:
+        tiles = _tiles_inside_geom(tilescheme, tiles, geom, classify)
+    return tiles
+
+
+def _cover_feature(tilescheme, fid, geom, zoom, adjacent, classify):
+    """Covers the geometry of one Feature in a worker process."""
+    return fid, list(_cover_tiles(tilescheme, geom, zoom, adjacent, classify))
+
+
+def _parallel_covers(tilescheme, geoms, zoom, adjacent, classify, jobs):
+    """Covers Features in a pool of worker processes.
+
+    Only a few Features per worker are handed out ahead of the one
+    whose tiles are being printed, so a long sequence is never read
+    into memory all at once.
+
+    Args:
+      tilescheme: The tile scheme to use.
+      geoms: Iterable of (id, geometry) tuples.
+      zoom: The zoom level of the tiles.
+      adjacent: Keep the tiles that only touch each geometry.
+      classify: Yield (tile, label) tuples rather than bare tiles.
+      jobs: The number of worker processes.
+
+    Yields:
+      (id, tiles) tuples, in the order of geoms.
+    """
+    pending = collections.deque()
+    with futures.ProcessPoolExecutor(jobs) as pool:
+        for fid, geom in geoms:
+            pending.append(pool.submit(_cover_feature, tilescheme, fid, geom,
+                                       zoom, adjacent, classify))
+            if len(pending) >= 4 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _echo_lines(lines, chunk_size=65536):
+    """Prints lines in chunks as they are generated.
+
+    Downstream programs get the first chunk while the rest are still
+    being worked out, and only one chunk is held in memory at a time.
+
+    Args:
+      lines: Iterable of strings to print, one per line.
+      chunk_size: The number of lines to print at once.
+
+    Returns:
+      The number of lines printed.
+    """
+    lines = iter(lines)
+    count = 0
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return count
+        click.echo("\n".join(chunk))
+        count += len(chunk)
+
+
+def _read_aoi(aoi_geojson):
+    """Reads a whole GeoJSON Feature or FeatureCollection.
+
+    Args:
+      aoi_geojson: File object holding the GeoJSON.
+
+    Returns:
+      The GeoJSON object read.
+    """
     aoi = geojson.loads( aoi_geojson.read() )
 
     if 'type' not in aoi:
         raise ValueError("The 'AOI_GEOJSON' doesn't have a 'type' member. Is it valid GeoJSON?")
-    elif aoi['type'] == 'FeatureCollection':
-        geom = ops.unary_union([geometry.shape(f['geometry'])
-                                for f in aoi['features']
-                                if f['geometry']['type'].endswith('Polygon')])
-    elif aoi['type'] == 'Feature':
-        geom = geometry.shape(aoi['geometry'])
-    else:
+    elif aoi['type'] not in ('Feature', 'FeatureCollection'):
         raise ValueError("The AOI_GEOJSON 'type' %s is unsupported, " % aoi['type'] +
                          "it must be 'Feature' or 'FeatureCollection'")
+    return aoi
 
-    tiles = tiletanic.tilecover.cover_geometry(scheme, geom, zoom)
 
-    if not adjacent:
-        tiles = _tiles_inside_geom(scheme, tiles, geom)
+def _read_features(aoi_geojson):
+    """Reads GeoJSON Features one line at a time.
+
+    Handles both newline delimited GeoJSON and GeoJSONSeq, whose
+    record separators are stripped along with the other whitespace.
+    Only one Feature is held in memory at a time.
 
-    if quadkey:
-        qks = [scheme.quadkey(t) for t in tiles]
-        click.echo( "\n".join( qks ) )
+    Args:
+      aoi_geojson: File object holding one Feature per line.
+
+    Yields:
+      Each Feature, skipping blank lines.
+    """
+    for line in aoi_geojson:
+        line = line.strip()
+        if not line:
+            continue
+        feature = geojson.loads(line)
+        if feature.get('type') != 'Feature':
+            raise ValueError("Each line of AOI_GEOJSON must be a 'Feature' "
+                             "when reading a sequence, not %s" % feature.get('type'))
+        yield feature
+
+
+def _feature_geoms(features):
+    """Pairs the geometry of each Feature with its id.
 
+    Args:
+      features: Iterable of GeoJSON Features.
+
+    Yields:
+      (id, geometry) tuples, where the id is the Feature's 'id'
+      member or, failing that, its index.  Features without a
+      geometry are skipped.
+    """
+    for index, feature in enumerate(features):
+        if feature['geometry'] is not None:
+            yield feature.get('id', index), geometry.shape(feature['geometry'])
 
-def _tiles_inside_geom(tilescheme, tiles, geom):
+
+def _tiles_inside_geom(tilescheme, tiles, geom, classified=False):
     """Filters out tiles do not contain the geometry geom
 
     Consider the nine adjacent tiles:
@@ -118,10 +449,15 @@ def _tiles_inside_geom(tilescheme, tiles, geom):
       tilescheme: The tile scheme to use.
       tiles: list iterable collection of tiles
       geom: Shapely Geometry area of interest
+      classified: tiles holds (tile, label) tuples from a classified
+                  cover rather than bare tiles
     """
     prep_geom = prepared.prep(geom)
     for t in tiles:
-        coords = tilescheme.bbox(t)
+        if classified and t[1] == tiletanic.tilecover.INTERIOR:
+            yield t
+            continue
+        coords = tilescheme.bbox(t[0] if classified else t)
         tile_geom = geometry.Polygon(((coords.xmin, coords.ymin),
                                       (coords.xmax, coords.ymin),
                                       (coords.xmax, coords.ymax),
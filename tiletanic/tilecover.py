@@ -1,124 +1,1036 @@
+import heapq
+import itertools
+import os
+from collections import deque, namedtuple
 from collections.abc import Iterable
+from concurrent import futures
 
+import numpy as np
+import shapely
+import shapely.wkb
 from shapely import geometry, ops, prepared
 
 from .base import Tile
+from .tileschemes import _interleave, _deinterleave
 
+# The vectorized predicates used by the breadth first strategy arrived
+# in shapely 2.0.
+_SHAPELY2 = int(shapely.__version__.split('.')[0]) >= 2
 
-def cover_geometry(tilescheme, geom, zooms):
+STRATEGIES = ('depth_first', 'breadth_first', 'rasterize', 'simplified')
+
+TileRanges = namedtuple('TileRanges', ['rows', 'starts', 'stops', 'zoom'])
+TileBlock = namedtuple('TileBlock', ['tile', 'zoom'])
+
+# How cover_geometry(..., classify=True) labels tiles.
+INTERIOR = 'interior'
+BOUNDARY = 'boundary'
+
+# The geometry a parallel cover worker process is covering, set up once
+# per process by _init_cover_worker.
+_worker = {}
+
+
+def cover_geometry(tilescheme, geom, zooms, strategy='depth_first', threads=1,
+                   classify=False):
     """Covers the provided geometry with tiles.
 
     Args:
         tilescheme: The tile scheme to use.  This needs to implement
                     the public protocal of the schemes defined within
-                    tiletanic.
+                    tiletanic.  Schemes that also have the vectorized
+                    bboxes() method must lay their tiles out evenly
+                    over the bounds of the tile at zoom level 0, as
+                    all of tiletanic's do, since Points and
+                    MultiPoints are then mapped onto tiles directly.
         geom: The geometry we would like to cover.  This should be a
               shapely geometry.
         zooms: The zoom levels of the tiles to cover geom with.  If
                you provide an iterable of zoom levels, you'll get the
                biggest tiles available that cover the geometry at
                those levels.
+        strategy: How to search the quadtree for the covering tiles.
+                  'depth_first' (the default) tests one tile at a time
+                  while walking down the tree.  'breadth_first' tests
+                  every candidate tile at a zoom level with a single
+                  vectorized shapely call, and needs shapely 2.0 or
+                  newer and a tilescheme with a bboxes() method.
+                  'rasterize' scan converts Polygons and MultiPolygons
+                  straight onto the tile grid at the finest zoom level
+                  and walks LineStrings and MultiLineStrings along the
+                  grid at the coarsest one (other geometries are
+                  walked depth first), and also needs a tilescheme
+                  with a bboxes() method.  'simplified' walks depth
+                  first, but tests tiles well above the finest zoom
+                  level against a simplified boundary first, which can
+                  pay off for geometries with very many vertices.  All
+                  of them yield the same tiles in the same order.
+                  Points and MultiPoints are mapped straight onto
+                  their tiles, whatever the strategy, if the
+                  tilescheme has a bboxes() method.
+        threads: The number of threads the 'breadth_first' strategy
+                 splits its vectorized shapely calls between.  Shapely
+                 releases the GIL inside them, so they really do run
+                 at the same time.
+        classify: Yield whether each tile lies inside the geometry
+                  along with it.  Only the 'depth_first' strategy
+                  does this.
 
     Yields:
         An iterator of Tile objects ((x, y, z) named tuples) that
-        cover the input geometry.
+        cover the input geometry.  With classify, an iterator of
+        (tile, INTERIOR) tuples for tiles that lie completely within
+        the geometry and (tile, BOUNDARY) tuples for the rest.
     """
     # Only shapely geometries allowed.
     if not isinstance(geom, geometry.base.BaseGeometry):
         raise ValueError("Input 'geom' is not a known shapely geometry type")
 
+    if strategy not in STRATEGIES:
+        raise ValueError("Unknown strategy '{}', must be one of {}".format(
+            strategy, ', '.join(STRATEGIES)))
+    if strategy == 'breadth_first' and not _SHAPELY2:
+        raise ValueError("The 'breadth_first' strategy requires shapely 2.0 or newer")
+    if threads < 1:
+        raise ValueError("At least one thread is needed")
+    if threads > 1 and strategy != 'breadth_first':
+        raise ValueError("Only the 'breadth_first' strategy can use more than one thread")
+    if classify and strategy != 'depth_first':
+        raise ValueError("Only the 'depth_first' strategy can classify tiles")
+
     if geom.is_empty:
         return
 
-    zooms = zooms if isinstance(zooms, Iterable) else [zooms]
+    zooms = set(zooms) if isinstance(zooms, Iterable) else {zooms}
+    if not zooms:
+        raise ValueError("At least one zoom level must be provided")
 
     # Generate the covering.
+    if classify:
+        if isinstance(geom, (geometry.Polygon, geometry.MultiPolygon)):
+            tiles = _cover_polygonal(tilescheme, Tile(0, 0, 0), prepared.prep(geom), geom,
+                                     zooms, classify=True)
+        else:
+            # Tiles can't lie inside anything but polygons.
+            tiles = ((tile, BOUNDARY) for tile in cover_geometry(tilescheme, geom, zooms))
+        for tile in tiles:
+            yield tile
+        return
+    if (isinstance(geom, (geometry.Point, geometry.MultiPoint)) and
+            0 < min(zooms) <= 31 and hasattr(tilescheme, 'bboxes')):
+        for tile in _cover_points(tilescheme, geom, min(zooms)):
+            yield tile
+        return
+    if strategy == 'breadth_first':
+        for tile in _cover_breadth_first(tilescheme, geom, zooms, threads):
+            yield tile
+        return
+
     prep_geom = prepared.prep(geom)    
+    approx = (_approximations(tilescheme, geom, zooms)
+              if strategy == 'simplified' else None)
     if isinstance(geom, (geometry.Polygon, geometry.MultiPolygon)):        
-        for tile in _cover_polygonal(tilescheme, Tile(0, 0, 0), prep_geom, geom, zooms):
+        if strategy == 'rasterize' and max(zooms) > 0:
+            for tile in _cover_rasterized(tilescheme, prep_geom, geom, zooms):
+                yield tile
+            return
+        for tile in _cover_polygonal(tilescheme, Tile(0, 0, 0), prep_geom, geom, zooms,
+                                     approx=approx):
+            yield tile
+    elif (strategy == 'rasterize' and min(zooms) > 0 and
+          isinstance(geom, (geometry.LineString, geometry.MultiLineString))):
+        for tile in _cover_traced(tilescheme, prep_geom, geom, min(zooms)):
             yield tile
     else:
-        for tile in _cover_geometry(tilescheme, Tile(0, 0, 0), prep_geom, geom, zooms):
+        for tile in _cover_geometry(tilescheme, Tile(0, 0, 0), prep_geom, geom, zooms,
+                                    approx=approx):
             yield tile
 
 
-def _cover_geometry(tilescheme, curr_tile, prep_geom, geom, zooms):
-    """Covers geometries with tiles by recursion. 
+def clip_to_tiles(tilescheme, geom, zoom):
+    """Splits the provided geometry into its pieces in each tile that
+    covers it.
+
+    The geometry is clipped down the quadtree: each tile's piece is
+    cut from its parent's piece rather than from the whole geometry,
+    so every clip works on a small geometry.  Once a tile lies
+    completely within a polygonal geometry, the pieces below it are
+    just the tile boxes.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic.
+        geom: The geometry we would like to clip.  This should be a
+              shapely geometry.
+        zoom: The zoom level of the tiles.
+
+    Yields:
+        An iterator of (tile, piece) tuples, where piece is the shapely
+        geometry of the part of geom within the tile, in depth first
+        order.
+    """
+    if not isinstance(geom, geometry.base.BaseGeometry):
+        raise ValueError("Input 'geom' is not a known shapely geometry type")
+
+    polygonal = isinstance(geom, (geometry.Polygon, geometry.MultiPolygon))
+
+    # (tile, parent's piece, whether the parent lies inside geom)
+    stack = [(Tile(0, 0, 0), geom, False)]
+    while stack:
+        tile, piece, inside = stack.pop()
+        tile_geom = geometry.box(*tilescheme.bbox(tile))
+        if inside:
+            piece = tile_geom
+        else:
+            if not piece.intersects(tile_geom):
+                continue
+            piece = piece.intersection(tile_geom)
+            inside = polygonal and piece.contains(tile_geom)
+
+        if tile.z == zoom:
+            yield tile, piece
+        else:
+            stack.extend((child, piece, inside)
+                         for child in reversed(tilescheme.children(tile)))
+
+
+def cover_geometry_ranges(tilescheme, geom, zoom):
+    """Covers the provided geometry with tiles at a zoom level, as runs
+    of tiles along each row.
+
+    Polygons and MultiPolygons are scan converted straight into runs,
+    so memory grows with the length of their boundaries rather than
+    with their area.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        geom: The geometry we would like to cover.  This should be a
+              shapely geometry.
+        zoom: The zoom level of the tiles to cover geom with.
+
+    Returns:
+        A TileRanges named tuple of (rows, starts, stops, zoom), where
+        rows, starts and stops are int64 arrays.  The tiles
+        (x, row, zoom) for start <= x < stop are the same tiles that
+        cover_geometry() finds.  Runs are sorted by row and then by
+        start, and never touch each other.
+    """
+    if not isinstance(geom, geometry.base.BaseGeometry):
+        raise ValueError("Input 'geom' is not a known shapely geometry type")
+
+    empty = np.zeros(0, dtype=np.int64)
+    if geom.is_empty:
+        return TileRanges(empty, empty, empty, zoom)
+
+    if isinstance(geom, (geometry.Polygon, geometry.MultiPolygon)) and 0 < zoom <= 31:
+        rows, starts, stops = _polygon_spans(tilescheme, prepared.prep(geom), geom, zoom)
+        return TileRanges(rows, starts, stops, zoom)
+
+    tiles = np.array(list(cover_geometry(tilescheme, geom, zoom, strategy='rasterize')),
+                     dtype=np.int64).reshape(-1, 3)
+    x, y = tiles[:, 0], tiles[:, 1]
+    order = np.lexsort((x, y))
+    x, y = x[order], y[order]
+    rows, starts, stops = _join_spans(y, x, x + 1)
+    return TileRanges(rows, starts, stops, zoom)
+
+
+def expand_ranges(ranges):
+    """Lazily expands runs of tiles back into the tiles themselves.
+
+    Args:
+        ranges: A TileRanges named tuple, as returned by
+                cover_geometry_ranges().
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) named tuples), row by
+        row.
+    """
+    for row, start, stop in zip(ranges.rows.tolist(), ranges.starts.tolist(),
+                                ranges.stops.tolist()):
+        for x in range(start, stop):
+            yield Tile(x, row, ranges.zoom)
+
+
+def cover_geometry_blocks(tilescheme, geom, zooms):
+    """Covers the provided geometry with blocks of tiles.
+
+    This is cover_geometry() with the expensive part left out: a tile
+    that lies completely within a polygonal geometry, but that has to
+    be broken up into its descendants at a finer zoom level, is
+    yielded once as a block instead of as all of those descendants.
 
     Args:
         tilescheme: The tile scheme to use.  This needs to implement
                     the public protocal of the schemes defined within
                     tiletanic.
-        curr_tile: The current tile in the recursion scheme.
+        geom: The geometry we would like to cover.  This should be a
+              shapely geometry.
+        zooms: The zoom levels of the tiles to cover geom with, as for
+               cover_geometry().
+
+    Yields:
+        An iterator of TileBlock objects ((tile, zoom) named tuples),
+        each standing for the descendants of tile at zoom, or for the
+        tile itself when zoom is tile.z.  Expanding them in order
+        gives exactly the tiles cover_geometry() yields.
+    """
+    if not isinstance(geom, geometry.base.BaseGeometry):
+        raise ValueError("Input 'geom' is not a known shapely geometry type")
+
+    if geom.is_empty:
+        return
+
+    zooms = set(zooms) if isinstance(zooms, Iterable) else {zooms}
+    if not zooms:
+        raise ValueError("At least one zoom level must be provided")
+
+    if isinstance(geom, (geometry.Polygon, geometry.MultiPolygon)):
+        tiles = _cover_polygonal(tilescheme, Tile(0, 0, 0), prepared.prep(geom), geom, zooms,
+                                 blocks=True)
+    else:
+        tiles = cover_geometry(tilescheme, geom, zooms)
+    for tile in tiles:
+        yield tile if isinstance(tile, TileBlock) else TileBlock(tile, tile.z)
+
+
+def cover_geometry_count(tilescheme, geom, zooms):
+    """Counts the tiles cover_geometry() yields, without listing the
+    ones inside polygonal geometries.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic.
+        geom: The geometry we would like to cover.  This should be a
+              shapely geometry.
+        zooms: The zoom levels of the tiles to cover geom with, as for
+               cover_geometry().
+
+    Returns:
+        The number of tiles.
+    """
+    return sum(4 ** (block.zoom - block.tile.z)
+               for block in cover_geometry_blocks(tilescheme, geom, zooms))
+
+
+def estimate_cover_count(tilescheme, geom, zoom, max_tiles=None):
+    """Counts the tiles covering a geometry at a zoom level without
+    listing them.
+
+    The quadtree is searched one zoom level at a time, and a tile that
+    lies completely within a polygonal geometry is counted as all
+    4**dz of its descendants at once, so the work grows with the
+    length of the boundary rather than with the area.  If the tiles
+    on the boundary at some level outnumber max_tiles, the search
+    stops there and each of them counts as somewhere between 1 and
+    all of its descendants.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        geom: The shapely geometry we would like to cover.
+        zoom: The zoom level of the tiles.
+        max_tiles: The most boundary tiles to test at any level, or
+                   None to always find the exact count.  Needs
+                   shapely 2.0 or newer.
+
+    Returns:
+        A tuple of (low, high) bounds on the number of tiles that
+        cover_geometry(tilescheme, geom, zoom) yields.  They are equal
+        when the count is exact.
+    """
+    if not isinstance(geom, geometry.base.BaseGeometry):
+        raise ValueError("Input 'geom' is not a known shapely geometry type")
+    if geom.is_empty:
+        return 0, 0
+    if not _SHAPELY2:
+        if max_tiles is not None:
+            raise ValueError("Estimating with 'max_tiles' requires shapely 2.0 or newer")
+        count = cover_geometry_count(tilescheme, geom, zoom)
+        return count, count
+
+    polygonal = isinstance(geom, (geometry.Polygon, geometry.MultiPolygon))
+    found = _search_breadth_first(tilescheme, geom, polygonal, zoom, max_tiles=max_tiles)
+    count = sum(len(x)*4**(zoom - z) for x, _, z in found)
+    x, _, z = found[-1]
+    if z < zoom and len(x):
+        # Stopped early: each of those tiles covers at least one tile
+        # at zoom.
+        return count - len(x)*(4**(zoom - z) - 1), count
+    return count, count
+
+
+def adaptive_cover_geometry(tilescheme, geom, max_tiles, min_zoom, max_zoom):
+    """Covers the provided geometry with at most max_tiles tiles,
+    spending them where they tighten the cover most.
+
+    The cover starts from the tiles at min_zoom.  The tile covering
+    the most area outside of the geometry is then repeatedly replaced
+    by its children that intersect the geometry, as long as that fits
+    in the budget, until no tile can be refined any further.  Each
+    tile's piece of the geometry is clipped from its parent's piece,
+    so the full geometry is only intersected with the coarsest tiles.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic.
+        geom: The geometry we would like to cover.  This should be a
+              shapely geometry.
+        max_tiles: The most tiles the cover may hold.
+        min_zoom: The coarsest zoom level of the tiles.
+        max_zoom: The finest zoom level of the tiles.
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) named tuples) that
+        cover the input geometry, in depth first order.
+    """
+    if not isinstance(geom, geometry.base.BaseGeometry):
+        raise ValueError("Input 'geom' is not a known shapely geometry type")
+    if min_zoom > max_zoom:
+        raise ValueError("min_zoom must not be greater than max_zoom")
+
+    if geom.is_empty:
+        return
+
+    tiles = list(cover_geometry(tilescheme, geom, min_zoom))
+    if len(tiles) > max_tiles:
+        raise ValueError("Covering at zoom level {} takes {} tiles, more than max_tiles".format(
+            min_zoom, len(tiles)))
+
+    # Tiles waiting to be refined, the most area outside of the
+    # geometry first.  The counter breaks ties in the order found.
+    prep_geom = prepared.prep(geom)
+    order = itertools.count()
+    queue = []
+    done = []
+
+    def push(tile, piece):
+        tile_geom = geometry.box(*tilescheme.bbox(tile))
+        piece = piece.intersection(tile_geom)
+        waste = tile_geom.area - piece.area
+        if tile.z < max_zoom and waste > 0:
+            heapq.heappush(queue, (-waste, next(order), tile, piece))
+        else:
+            done.append(tile)
+
+    for tile in tiles:
+        push(tile, geom)
+    count = len(tiles)
+    while queue:
+        _, _, tile, piece = heapq.heappop(queue)
+        children = [child for child in tilescheme.children(tile)
+                    if prep_geom.intersects(geometry.box(*tilescheme.bbox(child)))]
+        if count - 1 + len(children) > max_tiles:
+            done.append(tile)
+            continue
+        count += len(children) - 1
+        for child in children:
+            push(child, piece)
+
+    # Sorting by the Morton code of each tile's first descendant at
+    # max_zoom puts them in depth first order.
+    for tile in sorted(done, key=lambda t: _interleave(t.x, t.y) << 2*(max_zoom - t.z)):
+        yield tile
+
+
+class TileCover(object):
+    """A set of tiles at one zoom level, held as sorted runs of
+    consecutive Morton codes.
+
+    Sizes, membership tests, set algebra and changes of zoom level all
+    work on the runs, never on individual tiles, so a cover of tens of
+    millions of tiles takes space in proportion to its boundary.
+    Iterating over a TileCover yields its tiles in depth first
+    (quadkey) order, the order cover_geometry() yields them in.
+
+    Args:
+        starts: Array of the first Morton code of each run.
+        stops: Array of one past the last Morton code of each run.
+        zoom: The zoom level of the tiles, up to 31.
+    """
+    def __init__(self, starts, stops, zoom):
+        if not 0 <= zoom <= 31:
+            raise ValueError("TileCover supports zoom levels from 0 to 31")
+        self.zoom = zoom
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+        empty = np.zeros(0, dtype=np.int64)
+        self.starts, self.stops = _range_op((starts, stops), (empty, empty), np.logical_or)
+
+    @classmethod
+    def from_tiles(cls, tiles, zoom=None):
+        """Builds a TileCover from tiles.
+
+        Args:
+            tiles: An iterable of (x, y, z) tiles.  Tiles coarser
+                   than zoom stand for all of their descendants at
+                   zoom.
+            zoom: The zoom level of the cover.  Defaults to the finest
+                  zoom level among the tiles.
+
+        Returns:
+            A TileCover.
+        """
+        tiles = np.array(list(tiles), dtype=np.int64).reshape(-1, 3)
+        if zoom is None:
+            zoom = int(tiles[:, 2].max()) if len(tiles) else 0
+        if (tiles[:, 2] > zoom).any():
+            raise ValueError("Tiles must not be finer than zoom level {}".format(zoom))
+        shift = 2*(zoom - tiles[:, 2])
+        starts = _interleave(tiles[:, 0].astype(np.uint64),
+                             tiles[:, 1].astype(np.uint64)).astype(np.int64) << shift
+        return cls(starts, starts + (1 << shift), zoom)
+
+    @classmethod
+    def from_geometry(cls, tilescheme, geom, zoom):
+        """Covers a geometry with tiles at a zoom level.
+
+        With shapely 2.0 or newer, tiles that lie completely within a
+        polygonal geometry are kept as whole runs rather than being
+        broken up into their descendants.
+
+        Args:
+            tilescheme: The tile scheme to use.
+            geom: The shapely geometry we would like to cover.
+            zoom: The zoom level of the tiles, up to 31.
+
+        Returns:
+            A TileCover holding the tiles cover_geometry() finds.
+        """
+        if not isinstance(geom, geometry.base.BaseGeometry):
+            raise ValueError("Input 'geom' is not a known shapely geometry type")
+        if geom.is_empty or not _SHAPELY2:
+            return cls.from_tiles(cover_geometry(tilescheme, geom, zoom), zoom)
+
+        polygonal = isinstance(geom, (geometry.Polygon, geometry.MultiPolygon))
+        found = _search_breadth_first(tilescheme, geom, polygonal, zoom)
+        return cls.from_tiles(np.concatenate([
+            np.column_stack([x, y, np.full(len(x), z, dtype=np.int64)])
+            for x, y, z in found]), zoom)
+
+    def __len__(self):
+        return int((self.stops - self.starts).sum())
+
+    def __contains__(self, tile):
+        """Whether all of a tile lies within the cover.  Tiles finer
+        than the cover are looked up by their ancestor at its zoom."""
+        x, y, z = tile
+        morton = _interleave(x, y)
+        if z > self.zoom:
+            lo = morton >> 2*(z - self.zoom)
+            hi = lo + 1
+        else:
+            lo = morton << 2*(self.zoom - z)
+            hi = lo + (1 << 2*(self.zoom - z))
+        i = int(np.searchsorted(self.stops, lo, side='right'))
+        return i < len(self.starts) and self.starts[i] <= lo and hi <= self.stops[i]
+
+    def __iter__(self):
+        for start, stop in zip(self.starts.tolist(), self.stops.tolist()):
+            # Long runs are expanded a block at a time.
+            for block in range(start, stop, 1 << 16):
+                x, y = _deinterleave(np.arange(block, min(block + (1 << 16), stop),
+                                               dtype=np.uint64))
+                for tile in zip(x.tolist(), y.tolist()):
+                    yield Tile(tile[0], tile[1], self.zoom)
+
+    def __eq__(self, other):
+        return (isinstance(other, TileCover) and self.zoom == other.zoom and
+                np.array_equal(self.starts, other.starts) and
+                np.array_equal(self.stops, other.stops))
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'TileCover(zoom={}, tiles={}, runs={})'.format(
+            self.zoom, len(self), len(self.starts))
+
+    def to_zoom(self, zoom):
+        """Converts the cover to another zoom level.
+
+        Going finer, each tile is replaced by its descendants.  Going
+        coarser, each tile is replaced by its ancestor, so the new
+        cover holds every tile that overlaps the old one.
+
+        Args:
+            zoom: The zoom level to convert to, up to 31.
+
+        Returns:
+            A TileCover at zoom.
+        """
+        if zoom >= self.zoom:
+            shift = 2*(zoom - self.zoom)
+            return TileCover(self.starts << shift, self.stops << shift, zoom)
+        shift = 2*(self.zoom - zoom)
+        return TileCover(self.starts >> shift, ((self.stops - 1) >> shift) + 1, zoom)
+
+    def union(self, other):
+        """The tiles in either cover, at the finer of their zooms."""
+        return self._combine(other, np.logical_or)
+
+    def intersection(self, other):
+        """The tiles in both covers, at the finer of their zooms."""
+        return self._combine(other, np.logical_and)
+
+    def difference(self, other):
+        """The tiles in this cover but not the other, at the finer of
+        their zooms."""
+        return self._combine(other, np.logical_and, invert_b=True)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def _combine(self, other, op, invert_b=False):
+        zoom = max(self.zoom, other.zoom)
+        a, b = self.to_zoom(zoom), other.to_zoom(zoom)
+        starts, stops = _range_op((a.starts, a.stops), (b.starts, b.stops), op, invert_b)
+        return TileCover(starts, stops, zoom)
+
+
+def cover_geometries(tilescheme, geoms, zooms):
+    """Covers many geometries with tiles in a single walk down the
+    quadtree.
+
+    The walk goes one zoom level at a time.  The tiles at each level
+    are looked up in a shapely STRtree of the geometries, so each
+    level is searched once for all of the geometries rather than once
+    per geometry.  Needs shapely 2.0 or newer.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        geoms: A sequence of shapely geometries we would like to
+               cover.
+        zooms: The zoom levels of the tiles to cover the geometries
+               with, as for cover_geometry().
+
+    Yields:
+        An iterator of (index, Tile) tuples, where index is the
+        position of a geometry in geoms.  The tiles of each geometry
+        are the ones cover_geometry() yields for it, in the same
+        order, and the geometries come in the order of geoms.
+    """
+    if not _SHAPELY2:
+        raise ValueError("cover_geometries requires shapely 2.0 or newer")
+    geoms = np.asarray(geoms, dtype=object)
+    if not all(isinstance(geom, geometry.base.BaseGeometry) for geom in geoms):
+        raise ValueError("Input 'geoms' must all be known shapely geometry types")
+
+    zooms = set(zooms) if isinstance(zooms, Iterable) else {zooms}
+    if not zooms:
+        raise ValueError("At least one zoom level must be provided")
+    if max(zooms) > 32:
+        raise ValueError("cover_geometries supports zoom levels up to 32")
+
+    polygonal = np.array([isinstance(geom, (geometry.Polygon, geometry.MultiPolygon))
+                          for geom in geoms], dtype=bool)
+    target_zoom = np.where(polygonal, max(zooms), min(zooms))
+    # Work on prepared copies, leaving the caller's geometries alone
+    # for anything else that may be using them.
+    geoms = shapely.from_wkb(shapely.to_wkb(geoms))
+    tree = shapely.STRtree(geoms)
+    shapely.prepare(geoms)
+
+    # Each (geometry, tile) pair still being walked is keyed by the
+    # geometry's index and the position of the tile in the previous
+    # level, so tiles can be looked up in the tree for all geometries
+    # at once and then matched back to the pairs they came from.
+    found = []
+    x = np.zeros(1, dtype=np.int64)
+    y = np.zeros(1, dtype=np.int64)
+    parents = np.zeros(1, dtype=np.int64)
+    width = 1
+    walking = np.arange(len(geoms), dtype=np.int64)
+    for z in range(max(zooms) + 1):
+        boxes = shapely.box(*tilescheme.bboxes(x, y, z).T)
+        tiles, g = tree.query(boxes, predicate='intersects')
+        keep = np.isin(g*width + parents[tiles], walking)
+        tiles, g = tiles[keep], g[keep]
+
+        done = target_zoom[g] == z
+        found.append((g[done], x[tiles[done]], y[tiles[done]], z))
+        tiles, g = tiles[~done], g[~done]
+
+        # Contained tiles are finished; they are filled in at the
+        # right zoom levels afterwards.
+        inside = polygonal[g]
+        inside[inside] = shapely.contains_properly(geoms[g[inside]], boxes[tiles[inside]])
+        found.append((g[inside], x[tiles[inside]], y[tiles[inside]], z))
+        tiles, g = tiles[~inside], g[~inside]
+        if len(g) == 0:
+            break
+
+        parents, tiles = np.unique(tiles, return_inverse=True)
+        width = len(parents)
+        walking = g*width + tiles
+        x, y, parents = _child_tiles(tilescheme, x[parents], y[parents], z)
+
+    # Put each geometry's tiles together, then merge them just as a
+    # cover of that geometry alone would.
+    g = np.concatenate([g for g, _, _, _ in found])
+    x = np.concatenate([x for _, x, _, _ in found])
+    y = np.concatenate([y for _, _, y, _ in found])
+    z = np.concatenate([np.full(len(g), z, dtype=np.int64) for g, _, _, z in found])
+    order = np.argsort(g, kind='stable')
+    g, x, y, z = g[order], x[order], y[order], z[order]
+    starts = np.flatnonzero(np.diff(g, prepend=-1))
+    for start, stop in zip(starts.tolist(), np.r_[starts[1:], len(g)].tolist()):
+        index = int(g[start])
+        gx, gy, gz = x[start:stop], y[start:stop], z[start:stop]
+        by_zoom = [(gx[gz == zoom], gy[gz == zoom], zoom) for zoom in np.unique(gz).tolist()]
+        geom_zooms = zooms if polygonal[index] else {min(zooms)}
+        gx, gy, gz = _merge_zooms(by_zoom, geom_zooms, int(target_zoom[index]))
+        for tile in zip(gx.tolist(), gy.tolist(), gz.tolist()):
+            yield index, Tile(*tile)
+
+
+def parallel_cover_geometry(tilescheme, geom, zooms, workers=None, adjacent=True):
+    """Covers the provided geometry with tiles using a pool of worker
+    processes.
+
+    The quadtree is walked down to a frontier level with enough tiles
+    to keep every worker busy, and the subtrees below those tiles are
+    covered in parallel.  Each worker receives the geometry once, as
+    WKB, when it starts.  Unless covers of a polygonal geometry need
+    merging into tiles above the frontier (which only happens with
+    several zoom levels), each subtree's tiles are yielded as soon as
+    they and the subtrees before them are done, and only a few
+    subtrees per worker are handed out ahead of them.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, and be picklable.
+        geom: The geometry we would like to cover.  This should be a
+              shapely geometry.
+        zooms: The zoom levels of the tiles to cover geom with, as for
+               cover_geometry().
+        workers: The number of worker processes.  Defaults to the
+                 number of CPUs.  With a single worker the cover is
+                 found in this process.
+        adjacent: Include the tiles that only share boundary points
+                  with geom, and no interior points.  Leaving them
+                  out is done by the workers where it can be.
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) named tuples) that
+        cover the input geometry, the same tiles in the same order as
+        cover_geometry() yields.
+    """
+    if not isinstance(geom, geometry.base.BaseGeometry):
+        raise ValueError("Input 'geom' is not a known shapely geometry type")
+
+    workers = os.cpu_count() if workers is None else workers
+    if workers < 1:
+        raise ValueError("At least one worker is needed")
+
+    if geom.is_empty:
+        return
+
+    zooms = set(zooms) if isinstance(zooms, Iterable) else {zooms}
+    if not zooms:
+        raise ValueError("At least one zoom level must be provided")
+
+    if workers == 1:
+        tiles = cover_geometry(tilescheme, geom, zooms)
+        if not adjacent:
+            tiles = _untouched(tilescheme, prepared.prep(geom), tiles)
+        for tile in tiles:
+            yield tile
+        return
+
+    # Other geometries are covered at the coarsest zoom level, so their
+    # subtrees can't start any deeper than that.
+    polygonal = isinstance(geom, (geometry.Polygon, geometry.MultiPolygon))
+    max_level = max(zooms) if polygonal else min(zooms)
+
+    # Several subtrees per worker evens out the load between them.
+    prep_geom = prepared.prep(geom)
+    frontier = [Tile(0, 0, 0)]
+    while frontier and len(frontier) < 8*workers and frontier[0].z < max_level:
+        frontier = [child for tile in frontier
+                    for child in tilescheme.children(tile)
+                    if prep_geom.intersects(geometry.box(*tilescheme.bbox(child)))]
+    if not frontier:
+        return
+
+    # Subtrees come back in depth first order, so only polygonal covers
+    # at several zoom levels need merging into tiles above the
+    # frontier.  Everything else can be passed straight on.
+    merge = polygonal and len(zooms) > 1
+    found = []
+    subtrees = iter(frontier)
+    with futures.ProcessPoolExecutor(max_workers=min(workers, len(frontier)),
+                                     initializer=_init_cover_worker,
+                                     initargs=(tilescheme, geom.wkb, zooms,
+                                               adjacent or merge)) as pool:
+        pending = deque(pool.submit(_cover_subtree, tile)
+                        for tile in itertools.islice(subtrees, 2*workers))
+        while pending:
+            tiles = pending.popleft().result()
+            for tile in itertools.islice(subtrees, 1):
+                pending.append(pool.submit(_cover_subtree, tile))
+            if merge:
+                found.append(tiles)
+            else:
+                for tile in tiles.tolist():
+                    yield Tile(*tile)
+    if not merge:
+        return
+
+    tiles = np.concatenate(found)
+    found = [(tiles[tiles[:, 2] == z, 0], tiles[tiles[:, 2] == z, 1], z)
+             for z in np.unique(tiles[:, 2]).tolist()]
+    x, y, z = _merge_zooms(found, zooms, max(zooms))
+    tiles = (Tile(*tile) for tile in zip(x.tolist(), y.tolist(), z.tolist()))
+    if not adjacent:
+        tiles = _untouched(tilescheme, prep_geom, tiles)
+    for tile in tiles:
+        yield tile
+
+
+def _untouched(tilescheme, prep_geom, tiles):
+    """Leaves out the tiles that share only boundary points with a
+    geometry."""
+    for tile in tiles:
+        if not prep_geom.touches(geometry.box(*tilescheme.bbox(tile))):
+            yield tile
+
+
+def _init_cover_worker(tilescheme, wkb, zooms, adjacent=True):
+    """Sets up a parallel cover worker process."""
+    geom = shapely.wkb.loads(wkb)
+    _worker.update(tilescheme=tilescheme, geom=geom,
+                   prep_geom=prepared.prep(geom), zooms=zooms, adjacent=adjacent)
+
+
+def _cover_subtree(tile):
+    """Covers the worker's geometry below a frontier tile.
+
+    Returns:
+        An (N, 3) int64 array of the tiles, in depth first order.
+    """
+    tilescheme, geom, prep_geom, zooms = (
+        _worker['tilescheme'], _worker['geom'], _worker['prep_geom'], _worker['zooms'])
+    if isinstance(geom, (geometry.Polygon, geometry.MultiPolygon)):
+        # Merging into tiles above the frontier is left to the caller.
+        zooms = {zoom for zoom in zooms if zoom >= tile.z}
+        tiles = _cover_polygonal(tilescheme, tile, prep_geom, geom, zooms)
+    else:
+        tiles = _cover_geometry(tilescheme, tile, prep_geom, geom, zooms)
+    if not _worker['adjacent']:
+        tiles = _untouched(tilescheme, prep_geom, tiles)
+    return np.array(list(tiles), dtype=np.int64).reshape(-1, 3)
+
+
+def _cover_geometry(tilescheme, curr_tile, prep_geom, geom, zooms, approx=None):
+    """Covers geometries with tiles by walking the quadtree below
+    curr_tile depth first.
+
+    The walk uses an explicit stack rather than recursion, so every
+    tile is yielded exactly once, straight to the caller, in the same
+    order a recursive descent would produce.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic.
+        curr_tile: The tile at the root of the walk.
         prep_geom: The prepared version of the geometry we would like to cover.  
         geom: The shapely geometry we would like to cover.          
-        zooms: The zoom levels to recurse to.
+        zooms: The zoom levels to descend to.
+        approx: The simplified boundary of the geometry to test
+                tiles against first, as returned by _approximations.
 
     Yields:
         An iterator of Tile objects ((x, y, z) tuples) that
         cover the input geometry.
     """
-    if prep_geom.intersects(geometry.box(*tilescheme.bbox(curr_tile))):
-        if curr_tile.z in zooms:
-            yield curr_tile
-        else:
-            for tile in (tile for child_tile in tilescheme.children(curr_tile)
-                         for tile in _cover_geometry(tilescheme, child_tile,
-                                                     prep_geom, geom,
-                                                     zooms)):
+    stack = [curr_tile]
+    while stack:
+        tile = stack.pop()
+        bbox = tilescheme.bbox(tile)
+        hit = None
+        if approx and tile.z <= approx[2]:
+            hit = _approx_side(prep_geom, approx, bbox)
+        if hit is None:
+            hit = prep_geom.intersects(geometry.box(*bbox))
+        if hit:
+            if tile.z in zooms:
                 yield tile
+            else:
+                stack.extend(reversed(tilescheme.children(tile)))
 
 
-def _cover_polygonal(tilescheme, curr_tile, prep_geom, geom, zooms):
-    """Covers polygonal geometries with tiles by recursion. 
+def _cover_polygonal(tilescheme, curr_tile, prep_geom, geom, zooms, blocks=False,
+                     classify=False, approx=None):
+    """Covers polygonal geometries with tiles by walking the quadtree
+    below curr_tile depth first.
 
     This is method is slightly more efficient than _cover_geometry in
     that we can check if a tile is completely covered by a geometry
     and if so, skip directly to the max zoom level to fetch the
     covered tiles.
 
+    When more than one zoom level is requested, the tiles found below
+    a tile at one of those levels are held back until its subtree is
+    finished, so that they can be swapped for that tile if they cover
+    it completely.  A None on the stack marks the end of such a
+    subtree.
+
     Args:
         tilescheme: The tile scheme to use.  This needs to implement
                     the public protocal of the schemes defined within
                     tiletanic.
-        curr_tile: The current tile in the recursion scheme.
+        curr_tile: The tile at the root of the walk.
         prep_geom: The prepared version of the polygonal geometry we
                    would like to cover. 
         geom: The shapely polygonal geometry we would like to cover.          
-        zooms: The zoom levels to recurse to.
+        zooms: The zoom levels to descend to.
+        blocks: Yield a TileBlock for each covered tile that has to
+                be broken up into its descendants, rather than the
+                descendants themselves.
+        classify: Yield (tile, INTERIOR) or (tile, BOUNDARY) tuples
+                  rather than bare tiles.  Tiles at the finest zoom
+                  level get the one extra containment check this
+                  needs.
+        approx: The simplified boundary of the geometry to test
+                tiles against first, as returned by _approximations.
 
     Yields:
         An iterator of Tile objects ((x, y, z) tuples) that
         cover the input polygonal geometry.
     """
-    tile_geom = geometry.box(*tilescheme.bbox(curr_tile))
-    if prep_geom.intersects(tile_geom):
-        if curr_tile.z == max(zooms):
-            yield curr_tile
-        elif prep_geom.contains(tile_geom):
-            if curr_tile.z in zooms:
-                yield curr_tile
-            else:
-                for tile in (tile for child_tile in tilescheme.children(curr_tile)
-                             for tile in _containing_tiles(tilescheme, child_tile, zooms)):
-                    yield tile
+    max_zoom = max(zooms)
+
+    # [tile, held back tiles, coverage at max_zoom] for every tile in
+    # zooms whose subtree is still being walked, innermost last.
+    pending = []
+    stack = [curr_tile]
+    while stack:
+        tile = stack.pop()
+        if tile is None:
+            tile, tiles, coverage = pending.pop()
+            if coverage == 4 ** (max_zoom - tile.z):
+                if classify:
+                    inside = all(label == INTERIOR for _, label in tiles)
+                    tiles = [(tile, INTERIOR if inside else BOUNDARY)]
+                else:
+                    tiles = [tile]
         else:
-            tiles = []
-            coverage = 0
-            for tile in (tile for child_tile in tilescheme.children(curr_tile)
-                         for tile in _cover_polygonal(tilescheme, child_tile,
-                                                      prep_geom, geom, zooms)):
-                if curr_tile.z in zooms:
-                    tiles.append(tile)
-                    coverage += 4 ** (max(zooms) - tile.z)
+            bbox = tilescheme.bbox(tile)
+            tile_geom = geometry.box(*bbox)
+            inside = None # Only worked out when needed.
+            if approx and tile.z <= approx[2]:
+                inside = _approx_side(prep_geom, approx, bbox)
+            hit = inside if inside is not None else prep_geom.intersects(tile_geom)
+            if not hit:
+                continue
+            coverage = 4 ** (max_zoom - tile.z)
+            if tile.z == max_zoom:
+                if classify:
+                    inside = prep_geom.contains(tile_geom)
+                    tiles = [(tile, INTERIOR if inside else BOUNDARY)]
                 else:
-                    yield tile
-
-            if curr_tile.z in zooms and coverage == 4 ** (max(zooms) - curr_tile.z):
-                yield curr_tile
+                    tiles = [tile]
+            elif inside or (inside is None and prep_geom.contains(tile_geom)):
+                if tile.z in zooms:
+                    tiles = [tile]
+                elif blocks:
+                    tiles = [TileBlock(tile, min(zoom for zoom in zooms if zoom > tile.z))]
+                else:
+                    tiles = _containing_tiles(tilescheme, tile, zooms)
+                if classify:
+                    tiles = [(tile, INTERIOR) for tile in tiles]
             else:
-                for tile in tiles:
-                    yield tile
+                if tile.z in zooms:
+                    pending.append([tile, [], 0])
+                    stack.append(None)
+                stack.extend(reversed(tilescheme.children(tile)))
+                continue
+
+        if pending:
+            pending[-1][1].extend(tiles)
+            pending[-1][2] += coverage
+        else:
+            for tile in tiles:
+                yield tile
+
+
+def _approximations(tilescheme, geom, zooms):
+    """Simplifies the boundary of a geometry to test the tiles well
+    above the finest zoom level against.
+
+    The boundary (or the lines themselves, for lineal geometries) is
+    simplified with a tolerance of a sixteenth of a tile four levels
+    above the level the cover is found at, and the envelopes of the
+    simplified segments are indexed.  Douglas-Peucker keeps every
+    vertex it drops within the tolerance of the segment that replaced
+    it, so a tile farther than that from every envelope can't touch
+    the boundary: it lies entirely inside or entirely outside of the
+    geometry, and a single point settles which.  Only the tiles near
+    the boundary are tested against the full geometry, so the output
+    of the cover can't change.
+
+    Returns:
+        A (tree, tolerance, zoom) tuple, with the STRtree of segment
+        envelopes, the tolerance they were simplified with and the
+        finest zoom level to use them at, or None if the geometry
+        can't be or needn't be simplified.
+    """
+    if not _SHAPELY2:
+        return None
+    if isinstance(geom, (geometry.Polygon, geometry.MultiPolygon)):
+        lines, zoom = geom.boundary, max(zooms) - 4
+    elif isinstance(geom, (geometry.LineString, geometry.MultiLineString)):
+        lines, zoom = geom, min(zooms) - 4
+    else:
+        return None
+    if zoom < 1 or lines.is_empty:
+        return None
+
+    root = tilescheme.bbox(Tile(0, 0, 0))
+    tol = min(root.xmax - root.xmin, root.ymax - root.ymin) / 2**zoom / 16
+    parts = shapely.get_parts(lines)
+    simple = shapely.simplify(parts, tol, preserve_topology=False)
+
+    # A part that collapsed away leaves its stretch of boundary
+    # unaccounted for.
+    if shapely.is_empty(simple).any():
+        return None
+    coords, index = shapely.get_coordinates(simple, return_index=True)
+    same = index[1:] == index[:-1]
+    lo = np.minimum(coords[:-1], coords[1:])[same]
+    hi = np.maximum(coords[:-1], coords[1:])[same]
+    tree = shapely.STRtree(shapely.box(lo[:, 0], lo[:, 1], hi[:, 0], hi[:, 1]))
+    return tree, tol, zoom
+
+
+def _approx_side(prep_geom, approx, bbox):
+    """Whether a tile lies inside a geometry, using its simplified
+    boundary from _approximations.
+
+    Returns:
+        True if the tile lies entirely inside the geometry, False if
+        it lies entirely outside of it, or None if it is too near the
+        boundary to tell.
+    """
+    tree, tol, _ = approx
+    if len(tree.query(geometry.box(bbox.xmin - tol, bbox.ymin - tol,
+                                   bbox.xmax + tol, bbox.ymax + tol))):
+        return None
+    return prep_geom.intersects(geometry.Point(bbox.xmin, bbox.ymin))
 
 
 def _containing_tiles(tilescheme, curr_tile, zooms):
@@ -129,16 +1041,630 @@ def _containing_tiles(tilescheme, curr_tile, zooms):
         tilescheme: The tile scheme to use.  This needs to implement
                     the public protocal of the schemes defined within
                     tiletanic.
-        curr_tile: The current tile in the recursion scheme.
-        zooms: The zoom levels to recurse to.
+        curr_tile: The tile to break up.
+        zooms: The zoom levels to descend to.
 
     Yields:
         An iterator of Tile objects ((x, y, z) tuples) that
         compose the input tile.
     """
-    if curr_tile.z in zooms:
-        yield curr_tile
-    else:
-        for tile in (tile for child_tile in tilescheme.children(curr_tile)
-                     for tile in _containing_tiles(tilescheme, child_tile, zooms)):
+    stack = [curr_tile]
+    while stack:
+        tile = stack.pop()
+        if tile.z in zooms:
             yield tile
+        else:
+            stack.extend(reversed(tilescheme.children(tile)))
+
+
+def _cover_breadth_first(tilescheme, geom, zooms, threads=1):
+    """Covers geometries with tiles one zoom level at a time.
+
+    All of the candidate tiles at a zoom level are turned into boxes
+    and tested against the geometry with a single vectorized shapely
+    call, rather than one call per tile.  The tiles are yielded in
+    the same order as _cover_geometry and _cover_polygonal give them.
+
+    Shapely releases the GIL inside vectorized predicates, so with
+    more than one thread the boxes are split into batches that are
+    tested at the same time.  Each thread gets its own prepared copy
+    of the geometry, since GEOS builds the indexes of prepared
+    geometries lazily; geom itself is never prepared or tested.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        geom: The shapely geometry we would like to cover.
+        zooms: The set of zoom levels to descend to.
+        threads: The number of threads to test boxes on.
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) tuples) that
+        cover the input geometry.
+    """
+    polygonal = isinstance(geom, (geometry.Polygon, geometry.MultiPolygon))
+    if polygonal:
+        target_zoom = max(zooms)
+    else:
+        target_zoom = min(zooms)
+    if target_zoom > 32:
+        raise ValueError("The 'breadth_first' strategy supports zoom levels up to 32")
+    found = _search_breadth_first(tilescheme, geom, polygonal, target_zoom, threads)
+
+    x, y, z = _merge_zooms(found, zooms, target_zoom)
+    for tile in zip(x.tolist(), y.tolist(), z.tolist()):
+        yield Tile(*tile)
+
+
+def _search_breadth_first(tilescheme, geom, polygonal, target_zoom, threads=1,
+                          max_tiles=None):
+    """Finds the tiles covering a geometry one zoom level at a time,
+    down to target_zoom.
+
+    If max_tiles is given and the tiles still to be searched at a
+    level above target_zoom outnumber it, the search stops there.
+
+    Returns:
+        A list of (x, y, z) tuples, each holding int64 arrays of the
+        columns and rows of non-overlapping tiles at zoom z.  For
+        polygonal geometries, tiles above target_zoom lie completely
+        within the geometry, except in the last tuple of a search
+        stopped by max_tiles: that holds the tiles it stopped at.
+    """
+    # Prepare private copies: vectorized predicates on a prepared
+    # geometry aren't safe while another thread uses the same object,
+    # and the caller's geometry may well be shared with other covers.
+    geoms = [shapely.from_wkb(geom.wkb) for _ in range(threads)]
+    shapely.prepare(geoms)
+
+    found = []
+    x = np.zeros(1, dtype=np.int64)
+    y = np.zeros(1, dtype=np.int64)
+    with futures.ThreadPoolExecutor(threads) as pool:
+        for z in range(target_zoom + 1):
+            boxes = shapely.box(*tilescheme.bboxes(x, y, z).T)
+            hits = _batched(pool, shapely.intersects, geoms, boxes)
+            x, y, boxes = x[hits], y[hits], boxes[hits]
+            if z == target_zoom or len(x) == 0:
+                found.append((x, y, z))
+                break
+
+            if polygonal:
+                # Contained tiles are finished; they are filled in at
+                # the right zoom levels afterwards.
+                inside = _batched(pool, shapely.contains_properly, geoms, boxes)
+                found.append((x[inside], y[inside], z))
+                x, y = x[~inside], y[~inside]
+
+            if max_tiles is not None and len(x) > max_tiles:
+                found.append((x, y, z))
+                break
+
+            x, y, _ = _child_tiles(tilescheme, x, y, z)
+
+    return found
+
+
+def _child_tiles(tilescheme, x, y, z):
+    """Returns the children of many tiles at zoom level z.
+
+    Returns:
+        A tuple of (x, y, parents) int64 arrays, where parents holds
+        the position of each child's parent in the input arrays.
+        The children of each tile are in depth first order.
+    """
+    if z == 0:
+        # Schemes are allowed to be odd at level zero (DGTiling is).
+        children = tilescheme.children(Tile(0, 0, 0)) if len(x) else []
+        return (np.array([t.x for t in children], dtype=np.int64),
+                np.array([t.y for t in children], dtype=np.int64),
+                np.zeros(len(children), dtype=np.int64))
+    return ((2*x[:, np.newaxis] + [0, 1, 0, 1]).ravel(),
+            (2*y[:, np.newaxis] + [0, 0, 1, 1]).ravel(),
+            np.repeat(np.arange(len(x)), 4))
+
+
+def _batched(pool, predicate, geoms, boxes):
+    """Tests boxes against a geometry with a vectorized predicate,
+    splitting them between one copy of the geometry per thread."""
+    # Small batches aren't worth handing to another thread.
+    if len(geoms) == 1 or len(boxes) < 256*len(geoms):
+        return predicate(geoms[0], boxes)
+    batches = np.array_split(boxes, len(geoms))
+    return np.concatenate(list(pool.map(predicate, geoms, batches)))
+
+
+def _merge_zooms(found, zooms, target_zoom):
+    """Turns the tiles found by a cover search into the tiles that
+    cover_geometry yields.
+
+    Found tiles above target_zoom must lie completely within the
+    geometry.  Each one is broken up into its descendants at the next
+    of the zooms, and then, from the finest zoom to the coarsest, any
+    tile at one of the zooms whose descendants are all present replaces
+    them.  This is exactly what the depth first walk does as it goes.
+
+    Args:
+        found: A list of (x, y, z) tuples, each holding int64 arrays of
+               columns and rows of non-overlapping tiles at zoom z.
+        zooms: The set of zoom levels to cover with.
+        target_zoom: The finest zoom level anything was found at.
+
+    Returns:
+        A tuple of (x, y, z) int64 arrays holding the tiles, in depth
+        first (quadkey) order.
+    """
+    zooms = sorted(zoom for zoom in zooms if zoom <= target_zoom)
+
+    # Break up the found tiles so that everything sits at one of the
+    # zoom levels.
+    by_zoom = {zoom: ([], []) for zoom in zooms}
+    for x, y, z in found:
+        if len(x) == 0:
+            continue
+        zoom = min(zoom for zoom in zooms if zoom >= z)
+        dz = zoom - z
+        if dz:
+            dx, dy = _deinterleave(np.arange(4**dz, dtype=np.uint64))
+            x = ((x[:, np.newaxis] << dz) + dx.astype(np.int64)).ravel()
+            y = ((y[:, np.newaxis] << dz) + dy.astype(np.int64)).ravel()
+        by_zoom[zoom][0].append(x)
+        by_zoom[zoom][1].append(y)
+
+    # Merge complete sets of children into their ancestors, finest
+    # zoom first.  Once the finer zooms are merged, a tile is complete
+    # exactly when all of its descendants at the next finer zoom are
+    # present.
+    merged = {}
+    for finer, zoom in zip(reversed(zooms), list(reversed(zooms))[1:] + [None]):
+        x = np.concatenate(by_zoom[finer][0] or [np.zeros(0, dtype=np.int64)])
+        y = np.concatenate(by_zoom[finer][1] or [np.zeros(0, dtype=np.int64)])
+        if zoom is not None and len(x):
+            dz = finer - zoom
+            parents, counts = np.unique(np.stack([x >> dz, y >> dz]), axis=1,
+                                        return_counts=True)
+            full = parents[:, counts == 4**dz]
+            if full.shape[1]:
+                complete = np.isin(_interleave((x >> dz).astype(np.uint64),
+                                               (y >> dz).astype(np.uint64)),
+                                   _interleave(full[0].astype(np.uint64),
+                                               full[1].astype(np.uint64)))
+                x, y = x[~complete], y[~complete]
+                by_zoom[zoom][0].append(full[0])
+                by_zoom[zoom][1].append(full[1])
+        merged[finer] = (x, y)
+
+    # Put everything in depth first order by sorting on the Morton
+    # code of each tile's first descendant at target_zoom.
+    x = np.concatenate([merged[zoom][0] for zoom in zooms])
+    y = np.concatenate([merged[zoom][1] for zoom in zooms])
+    z = np.concatenate([np.full(len(merged[zoom][0]), zoom, dtype=np.int64)
+                        for zoom in zooms])
+    keys = _interleave(x.astype(np.uint64), y.astype(np.uint64)) \
+        << (2*(target_zoom - z)).astype(np.uint64)
+    order = np.argsort(keys, kind='stable')
+    return x[order], y[order], z[order]
+
+
+def _cover_rasterized(tilescheme, prep_geom, geom, zooms):
+    """Covers polygonal geometries by scan converting them at the
+    finest zoom level, then merging up to the coarser ones.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        prep_geom: The prepared version of the polygonal geometry we
+                   would like to cover.
+        geom: The shapely polygonal geometry we would like to cover.
+        zooms: The set of zoom levels to cover with.
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) tuples) that cover the
+        input polygonal geometry, in depth first order.
+    """
+    zoom = max(zooms)
+    rows, starts, stops = _polygon_spans(tilescheme, prep_geom, geom, zoom)
+    x, y = _expand_spans(rows, starts, stops)
+    x, y, z = _merge_zooms([(x, y, zoom)], zooms, zoom)
+    for tile in zip(x.tolist(), y.tolist(), z.tolist()):
+        yield Tile(*tile)
+
+
+def _cover_traced(tilescheme, prep_geom, geom, zoom):
+    """Covers linear geometries by walking each segment across the
+    tile grid at a zoom level.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        prep_geom: The prepared version of the linear geometry we
+                   would like to cover.
+        geom: The shapely LineString or MultiLineString we would like
+              to cover.
+        zoom: The zoom level of the tiles, between 1 and 31.
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) tuples) that cover the
+        input linear geometry, in depth first order.
+    """
+    if not 0 < zoom <= 31:
+        raise ValueError("Rasterized covers support zoom levels from 1 to 31")
+
+    lines = geom.geoms if hasattr(geom, 'geoms') else [geom]
+    u0, v0, u1, v1 = _tile_segments(tilescheme, [line.coords for line in lines], zoom)
+    sure_x, sure_y, near_x, near_y = _traced_cells(u0, v0, u1, v1, zoom)
+    hits = _intersecting(tilescheme, prep_geom, geom, near_x, near_y, zoom)
+    x = np.concatenate([sure_x, near_x[hits]])
+    y = np.concatenate([sure_y, near_y[hits]])
+
+    x, y = _expand_spans(*_clip_spans(tilescheme, y, x, x + 1, zoom))
+    x, y, z = _merge_zooms([(x, y, zoom)], {zoom}, zoom)
+    for tile in zip(x.tolist(), y.tolist(), z.tolist()):
+        yield Tile(*tile)
+
+
+def _cover_points(tilescheme, geom, zoom):
+    """Covers points by mapping each one straight onto its tile.
+
+    A point lying on a tile edge intersects the tiles on both sides of
+    it, so up to four tiles cover it.  Points within rounding distance
+    of an edge are checked against the bounding boxes of the tiles
+    around them, so the cover is the same as the quadtree walk's.
+
+    Args:
+        tilescheme: The tile scheme to use.  This needs to implement
+                    the public protocal of the schemes defined within
+                    tiletanic, plus the vectorized bboxes() method.
+        geom: The shapely Point or MultiPoint we would like to cover.
+        zoom: The zoom level of the tiles, between 1 and 31.
+
+    Yields:
+        An iterator of Tile objects ((x, y, z) tuples) that cover the
+        input points, in depth first order.
+    """
+    if _SHAPELY2:
+        coords = shapely.get_coordinates(geom)
+    else:
+        points = geom.geoms if hasattr(geom, 'geoms') else [geom]
+        coords = np.array([(point.x, point.y) for point in points], dtype=np.float64)
+    to_u, to_v = _tile_space(tilescheme, zoom)
+    u, v = to_u(coords[:, 0]), to_v(coords[:, 1])
+
+    # Each point is in the tiles around it within rounding distance.
+    eps = _grid_eps(zoom)
+    x0, x1 = np.floor(u - eps).astype(np.int64), np.floor(u + eps).astype(np.int64)
+    y0, y1 = np.floor(v - eps).astype(np.int64), np.floor(v + eps).astype(np.int64)
+    sure = (x0 == x1) & (y0 == y1)
+
+    # Check the points near tile edges against each tile around them.
+    near = np.flatnonzero(~sure)
+    near_x = np.concatenate([x0[near], x1[near], x0[near], x1[near]])
+    near_y = np.concatenate([y0[near], y0[near], y1[near], y1[near]])
+    near = np.tile(near, 4)
+    bboxes = tilescheme.bboxes(near_x, near_y, zoom)
+    if _SHAPELY2:
+        hits = shapely.intersects(shapely.points(coords[near]), shapely.box(*bboxes.T))
+    else:
+        hits = np.array([geometry.Point(*point).intersects(geometry.box(*bbox))
+                         for point, bbox in zip(coords[near].tolist(), bboxes.tolist())],
+                        dtype=bool)
+
+    x = np.concatenate([x0[sure], near_x[hits]])
+    y = np.concatenate([y0[sure], near_y[hits]])
+    size = 2**zoom
+    on_grid = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+    x, y = x[on_grid], y[on_grid]
+    x, y = _expand_spans(*_clip_spans(tilescheme, y, x, x + 1, zoom))
+
+    # Sorting by Morton code puts the tiles in depth first order.
+    x, y = _deinterleave(np.unique(_interleave(x.astype(np.uint64), y.astype(np.uint64))))
+    for tile in zip(x.tolist(), y.tolist()):
+        yield Tile(tile[0], tile[1], zoom)
+
+
+def _polygon_spans(tilescheme, prep_geom, geom, zoom):
+    """Finds the tiles at a zoom level that intersect a polygonal
+    geometry, as runs of tiles along each row.
+
+    The rings of the polygons are scan converted in tile coordinates.
+    Tiles that the rings pass through, and tiles between a pair of
+    ring crossings on a row, are in the cover.  Only tiles that a ring
+    passes so close to that floating point rounding could change the
+    answer are checked against the geometry with a predicate, so the
+    work grows with the size of the output instead of the number of
+    tiles tested on the way down the quadtree.
+
+    Args:
+        tilescheme: The tile scheme to use.
+        prep_geom: The prepared version of the polygonal geometry.
+        geom: The shapely polygonal geometry.
+        zoom: The zoom level of the tiles, between 1 and 31.
+
+    Returns:
+        A tuple of (rows, starts, stops) int64 arrays.  The tiles
+        (x, row, zoom) for starts <= x < stops are the cover.  Spans
+        are sorted by row and then by start and never touch each other.
+    """
+    if not 0 < zoom <= 31:
+        raise ValueError("Rasterized covers support zoom levels from 1 to 31")
+
+    polygons = geom.geoms if hasattr(geom, 'geoms') else [geom]
+    rings = [ring.coords
+             for polygon in polygons
+             for ring in [polygon.exterior] + list(polygon.interiors)]
+    u0, v0, u1, v1 = _tile_segments(tilescheme, rings, zoom)
+
+    # Tiles the rings pass through or close to.
+    size = 2**zoom
+    sure_x, sure_y, near_x, near_y = _traced_cells(u0, v0, u1, v1, zoom)
+
+    # Tiles between the crossings of the rings with each row's center
+    # line.  Those that the rings come close to are handled above.
+    rows, starts, stops = _fill_spans(u0, v0, u1, v1)
+    starts, stops = np.maximum(starts, 0), np.minimum(stops, size)
+    on_grid = (rows >= 0) & (rows < size) & (starts < stops)
+    rows, starts, stops = rows[on_grid], starts[on_grid], stops[on_grid]
+
+    width = size + 1 # Leaves a gap between rows so spans can't join.
+    keys = (rows*width + starts, rows*width + stops)
+    near = np.concatenate([near_y*width + near_x, sure_y*width + sure_x])
+    keys = _range_op(keys, (near, near + 1), np.logical_and, invert_b=True)
+
+    hits = _intersecting(tilescheme, prep_geom, geom, near_x, near_y, zoom)
+    cells = np.concatenate([sure_y*width + sure_x,
+                            near_y[hits]*width + near_x[hits]])
+    keys = _range_op(keys, (cells, cells + 1), np.logical_or)
+
+    starts, stops = keys
+    rows = starts // width
+    starts, stops = starts - rows*width, stops - rows*width
+    return _clip_spans(tilescheme, rows, starts, stops, zoom)
+
+
+def _grid_eps(zoom):
+    """Distance, in tiles, within which rounding error could put a
+    point on either side of a tile edge at the given zoom level."""
+    return 1e-9 + 2.**zoom*1e-13
+
+
+def _tile_space(tilescheme, zoom):
+    """Returns functions mapping geospatial x and y coordinates onto
+    fractional tile columns and rows at a zoom level."""
+    root = tilescheme.bbox(Tile(0, 0, 0))
+    scale_x = 2.**zoom/(root.xmax - root.xmin)
+    scale_y = 2.**zoom/(root.ymax - root.ymin)
+    if tilescheme.bbox(Tile(0, 0, 1)).ymin == root.ymin: # Rows count up.
+        return (lambda x: (x - root.xmin)*scale_x,
+                lambda y: (y - root.ymin)*scale_y)
+    else: # Rows count down from the top.
+        return (lambda x: (x - root.xmin)*scale_x,
+                lambda y: (root.ymax - y)*scale_y)
+
+
+def _tile_segments(tilescheme, lines, zoom):
+    """Returns the (u0, v0, u1, v1) tile space endpoints of every
+    segment of a list of coordinate sequences."""
+    to_u, to_v = _tile_space(tilescheme, zoom)
+    coords = [np.asarray(line)[:, :2] for line in lines if len(line)]
+    starts = np.concatenate([c[:-1] for c in coords])
+    ends = np.concatenate([c[1:] for c in coords])
+    return to_u(starts[:, 0]), to_v(starts[:, 1]), to_u(ends[:, 0]), to_v(ends[:, 1])
+
+
+def _traced_cells(u0, v0, u1, v1, zoom):
+    """Finds the tiles at a zoom level that line segments pass through.
+
+    Args:
+        u0, v0, u1, v1: Arrays of segment endpoints in tile space.
+        zoom: The zoom level of the tiles.
+
+    Returns:
+        A tuple of (sure_x, sure_y, near_x, near_y) int64 arrays.  The
+        segments certainly pass through the sure tiles, and the near
+        tiles are the other tiles that rounding could put them in,
+        which need an exact check.  Only tiles on the grid are kept.
+    """
+    size = 2**zoom
+    sure_x, sure_y, near_x, near_y = _segment_cells(u0, v0, u1, v1, _grid_eps(zoom))
+    on_grid = (sure_x >= 0) & (sure_x < size) & (sure_y >= 0) & (sure_y < size)
+    sure = np.unique(sure_y[on_grid]*size + sure_x[on_grid])
+    on_grid = (near_x >= 0) & (near_x < size) & (near_y >= 0) & (near_y < size)
+    near = np.setdiff1d(near_y[on_grid]*size + near_x[on_grid], sure)
+    return sure % size, sure // size, near % size, near // size
+
+
+def _segment_cells(u0, v0, u1, v1, eps):
+    """Finds the grid cells that line segments pass through.
+
+    Each segment is cut where it crosses grid lines, Amanatides-Woo
+    style, leaving pieces that each lie within a single cell.  When
+    the middle of a piece is further than eps from the cell's edges,
+    the segment certainly passes through that cell.  Every other cell
+    within eps of a piece might touch the segment, depending on
+    rounding, and has to be checked exactly.
+
+    Args:
+        u0, v0, u1, v1: Arrays of segment endpoints in tile space.
+        eps: The rounding tolerance, in tiles.
+
+    Returns:
+        A tuple of (sure_x, sure_y, near_x, near_y) int64 arrays of
+        cells that certainly touch a segment and cells that might.
+    """
+    du, dv = u1 - u0, v1 - v0
+    seg = np.arange(len(u0))
+
+    # Parameters at which the segments cross vertical and horizontal
+    # grid lines, plus the endpoints.
+    params = [np.zeros(len(u0)), np.ones(len(u0))]
+    segs = [seg, seg]
+    for a0, a1, da in ((u0, u1, du), (v0, v1, dv)):
+        first = np.floor(np.minimum(a0, a1)) + 1
+        count = np.maximum(np.ceil(np.maximum(a0, a1)) - first, 0).astype(np.int64)
+        which = np.repeat(seg, count)
+        lines = first[which] + _ramp(count)
+        params.append((lines - a0[which])/da[which])
+        segs.append(which)
+    params = np.concatenate(params)
+    segs = np.concatenate(segs)
+    order = np.lexsort((params, segs))
+    params, segs = params[order], segs[order]
+
+    # The pieces between consecutive parameters of the same segment.
+    piece = segs[1:] == segs[:-1]
+    which, ta, tb = segs[1:][piece], params[:-1][piece], params[1:][piece]
+
+    def point(t):
+        return (np.where(t == 1, u1[which], u0[which] + t*du[which]),
+                np.where(t == 1, v1[which], v0[which] + t*dv[which]))
+    ua, va = point(ta)
+    ub, vb = point(tb)
+    um, vm = point((ta + tb)/2)
+
+    mid_x, mid_y = np.floor(um), np.floor(vm)
+    sure = np.minimum.reduce([um - mid_x, mid_x + 1 - um,
+                              vm - mid_y, mid_y + 1 - vm]) > eps
+
+    # Cells within eps of each piece: at most three in each direction.
+    near_x, near_y = [], []
+    xlo, xhi = np.floor(np.minimum(ua, ub) - eps), np.floor(np.maximum(ua, ub) + eps)
+    ylo, yhi = np.floor(np.minimum(va, vb) - eps), np.floor(np.maximum(va, vb) + eps)
+    for dx in range(3):
+        for dy in range(3):
+            keep = (xlo + dx <= xhi) & (ylo + dy <= yhi)
+            near_x.append(xlo[keep] + dx)
+            near_y.append(ylo[keep] + dy)
+
+    return (mid_x[sure].astype(np.int64), mid_y[sure].astype(np.int64),
+            np.concatenate(near_x).astype(np.int64),
+            np.concatenate(near_y).astype(np.int64))
+
+
+def _fill_spans(u0, v0, u1, v1):
+    """Scan converts closed rings by the even-odd rule.
+
+    Every row's center line is intersected with the ring segments,
+    counting a segment when the line is at or above its lower end and
+    below its upper end.  Cells whose centers fall between consecutive
+    pairs of crossings are inside.
+
+    Args:
+        u0, v0, u1, v1: Arrays of ring segment endpoints in tile space.
+
+    Returns:
+        A tuple of (rows, starts, stops) int64 arrays of runs of cells
+        whose centers are inside the rings.
+    """
+    vmin, vmax = np.minimum(v0, v1), np.maximum(v0, v1)
+    first = np.ceil(vmin - 0.5)
+    count = np.maximum(np.ceil(vmax - 0.5) - first, 0).astype(np.int64)
+    which = np.repeat(np.arange(len(u0)), count)
+    rows = first[which] + _ramp(count)
+    centers = rows + 0.5
+    crossings = u0[which] + (centers - v0[which])*(u1[which] - u0[which])/(v1[which] - v0[which])
+
+    order = np.lexsort((crossings, rows))
+    rows, crossings = rows[order], crossings[order]
+    rows = rows[::2].astype(np.int64)
+    starts = np.floor(crossings[::2] - 0.5).astype(np.int64) + 1
+    stops = np.ceil(crossings[1::2] - 0.5).astype(np.int64)
+    keep = starts < stops
+    return rows[keep], starts[keep], stops[keep]
+
+
+def _clip_spans(tilescheme, rows, starts, stops, zoom):
+    """Restricts spans of tiles to those the tilescheme reaches from
+    Tile(0, 0, 0), which is all of the grid for most schemes but only
+    the bottom half for DGTiling, say."""
+    half = 2**(zoom - 1)
+    parts = []
+    for quadrant in tilescheme.children(Tile(0, 0, 0)):
+        keep = (rows >> (zoom - 1)) == quadrant.y
+        lo = np.maximum(starts[keep], quadrant.x*half)
+        hi = np.minimum(stops[keep], (quadrant.x + 1)*half)
+        parts.append((rows[keep][lo < hi], lo[lo < hi], hi[lo < hi]))
+    rows, starts, stops = (np.concatenate(p) for p in zip(*parts))
+    order = np.lexsort((starts, rows))
+    return _join_spans(rows[order], starts[order], stops[order])
+
+
+def _join_spans(rows, starts, stops):
+    """Joins sorted, non-overlapping spans that touch end to end."""
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (starts[1:] != stops[:-1])
+    last = np.ones(len(rows), dtype=bool)
+    last[:-1] = first[1:]
+    return rows[first], starts[first], stops[last]
+
+
+def _intersecting(tilescheme, prep_geom, geom, x, y, zoom):
+    """Boolean mask of the (x, y, zoom) tiles that intersect geom."""
+    if len(x) == 0:
+        return np.zeros(0, dtype=bool)
+    if _SHAPELY2:
+        # Test against a private prepared copy, as _search_breadth_first
+        # does, never the caller's geometry.
+        copy = shapely.from_wkb(geom.wkb)
+        shapely.prepare(copy)
+        boxes = shapely.box(*tilescheme.bboxes(x, y, zoom).T)
+        return shapely.intersects(copy, boxes)
+    return np.array([prep_geom.intersects(geometry.box(*tilescheme.bbox(tile)))
+                     for tile in zip(x.tolist(), y.tolist(), [zoom]*len(x))],
+                    dtype=bool)
+
+
+def _ramp(counts):
+    """Concatenation of arange(c) for each count c."""
+    total = counts.sum()
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(total) - offsets
+
+
+def _expand_spans(rows, starts, stops):
+    """Columns and rows of every tile in runs of tiles along rows."""
+    counts = stops - starts
+    return np.repeat(starts, counts) + _ramp(counts), np.repeat(rows, counts)
+
+
+def _range_op(a, b, op, invert_b=False):
+    """Combines two sets of half open integer ranges.
+
+    Args:
+        a: A tuple of (starts, stops) int64 arrays of ranges.
+        b: Another tuple of (starts, stops) int64 arrays of ranges.
+        op: A boolean NumPy ufunc, such as np.logical_or for the union
+            or np.logical_and for the intersection.
+        invert_b: Use the complement of b, e.g. to take the difference
+                  a - b with np.logical_and.  The combination must
+                  still be bounded.
+
+    Returns:
+        A tuple of (starts, stops) int64 arrays of the sorted, merged
+        ranges covered by op(a, b).
+    """
+    (a_starts, a_stops), (b_starts, b_stops) = a, b
+    na, nb = len(a_starts), len(b_starts)
+    if na + nb == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    pos = np.concatenate([a_starts, a_stops, b_starts, b_stops]).astype(np.int64)
+    da = np.concatenate([np.ones(na), -np.ones(na), np.zeros(2*nb)]).astype(np.int64)
+    db = np.concatenate([np.zeros(2*na), np.ones(nb), -np.ones(nb)]).astype(np.int64)
+
+    order = np.argsort(pos, kind='stable')
+    pos = pos[order]
+    in_a = np.cumsum(da[order]) > 0
+    in_b = np.cumsum(db[order]) > 0
+    if invert_b:
+        in_b = ~in_b
+
+    # Only the state after the last event at each position counts.
+    last = np.append(pos[1:] != pos[:-1], True)
+    pos = pos[last]
+    inside = op(in_a[last], in_b[last])
+
+    change = np.diff(np.concatenate([[0], inside.astype(np.int8)]))
+    return pos[change == 1], pos[change == -1]
+
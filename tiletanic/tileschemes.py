@@ -7,10 +7,153 @@ Tiletanic package.
 from math import floor, ceil, log2
 import re
 
+import numpy as np
+
 from . import Tile, Coords, CoordsBbox
 
 qk_regex = re.compile(r'[0-3]+$')
 
+# Quadints pack a quadkey into 64 bits: the quadkey's base 4 digits
+# are left aligned in the upper 58 bits and the zoom level sits in the
+# lower 6 bits.  Sorting quadints is the same as sorting the quadkeys
+# they represent, since a parent quadint always sorts directly in front
+# of its descendants.
+MAX_QUADINT_ZOOM = 29
+_QUADINT_ZOOM_BITS = 6
+_QUADINT_ZOOM_MASK = (1 << _QUADINT_ZOOM_BITS) - 1
+
+# Translate quadkey digits into the tile column and row bits they hold.
+_qk_to_x = str.maketrans('0123', '0101')
+_qk_to_y = str.maketrans('0123', '0011')
+
+# Translates a hex digit into the two quadkey digits it holds.
+_hex_to_qk = str.maketrans({h: '{}{}'.format(int(h, 16) >> 2, int(h, 16) & 3)
+                            for h in '0123456789abcdef'})
+
+
+def quadkey_to_quadint(qk):
+    """Returns the quadint (packed integer quadkey) of the input quadkey.
+
+    Args:
+        qk: A string representing the quadkey.
+
+    Returns:
+        The quadint represented by the input quadkey.
+    """
+    if qk and not qk_regex.match(qk):
+        raise ValueError("Input quadkey is invalid.")
+    if len(qk) > MAX_QUADINT_ZOOM:
+        raise ValueError("Quadkeys longer than {} digits can't be packed "
+                         "into a quadint".format(MAX_QUADINT_ZOOM))
+    return _pack_quadint(int(qk, 4) if qk else 0, len(qk))
+
+
+def quadint_to_quadkey(qi):
+    """Returns the quadkey represented by the input quadint.
+
+    Args:
+        qi: The quadint (packed integer quadkey).
+
+    Returns:
+        The quadkey string represented by the input quadint.
+    """
+    morton, z = _unpack_quadint(int(qi))
+    return _morton_to_quadkey(morton, z)
+
+
+def _spread_bits(v):
+    """Spreads the lower 32 bits of v out to the even bits of a 64 bit
+    value.
+
+    Works the same on Python ints and on NumPy uint64 arrays.
+    """
+    v = v & 0x00000000FFFFFFFF
+    v = (v | (v << 16)) & 0x0000FFFF0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v << 2)) & 0x3333333333333333
+    v = (v | (v << 1)) & 0x5555555555555555
+    return v
+
+
+def _compact_bits(v):
+    """Gathers the even bits of a 64 bit value into its lower 32 bits;
+    the inverse of _spread_bits.
+
+    Works the same on Python ints and on NumPy uint64 arrays.
+    """
+    v = v & 0x5555555555555555
+    v = (v | (v >> 1)) & 0x3333333333333333
+    v = (v | (v >> 2)) & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v >> 4)) & 0x00FF00FF00FF00FF
+    v = (v | (v >> 8)) & 0x0000FFFF0000FFFF
+    v = (v | (v >> 16)) & 0x00000000FFFFFFFF
+    return v
+
+
+def _interleave(x, y):
+    """Morton code of a tile column and row, x taking the even bits."""
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+def _deinterleave(morton):
+    """Tile column and row of a Morton code; inverse of _interleave."""
+    return _compact_bits(morton), _compact_bits(morton >> 1)
+
+
+def _xy_to_quadkey(x, y, z):
+    """Quadkey digits of the tile at column x, row y and zoom z.
+
+    Writing x and y in binary and reading those digits back as decimal
+    numbers spreads every bit into its own decimal digit, so x + 2*y
+    has exactly the quadkey's digits with no carries between them.
+    """
+    if z == 0:
+        return ''
+    qk = str(int(format(x, 'b')) + 2*int(format(y, 'b'))).zfill(z)
+    return qk[-z:]
+
+
+def _quadkey_to_xy(qk):
+    """Column and row bits of a (validated) quadkey string."""
+    return int(qk.translate(_qk_to_x), 2), int(qk.translate(_qk_to_y), 2)
+
+
+def _pack_quadint(morton, z):
+    """Left aligns a Morton code of zoom z and tags it with z."""
+    return ((morton << (2*(MAX_QUADINT_ZOOM - z))) << _QUADINT_ZOOM_BITS) | z
+
+
+def _unpack_quadint(qi):
+    """Splits a quadint into its Morton code and zoom level.
+
+    Works the same on Python ints and on NumPy uint64 arrays.
+    """
+    z = qi & _QUADINT_ZOOM_MASK
+    if np.any(z > MAX_QUADINT_ZOOM):
+        raise ValueError("Zoom levels above {} can't be packed into a "
+                         "quadint".format(MAX_QUADINT_ZOOM))
+    return (qi >> _QUADINT_ZOOM_BITS) >> (2*(MAX_QUADINT_ZOOM - z)), z
+
+
+def _morton_to_quadkey(morton, z):
+    """Formats the Morton code of a zoom z tile as a quadkey string."""
+    if z == 0:
+        return ''
+    qk = format(morton, '0{}x'.format((z + 1)//2)).translate(_hex_to_qk)
+    return qk[1:] if z % 2 else qk
+
+
+def _quadints(morton, z):
+    """Vectorized _pack_quadint over arrays of Morton codes and zooms."""
+    morton, z = np.broadcast_arrays(np.asarray(morton, dtype=np.uint64),
+                                    np.asarray(z, dtype=np.uint64))
+    if np.any(z > MAX_QUADINT_ZOOM):
+        raise ValueError("Zoom levels above {} can't be packed into a "
+                         "quadint".format(MAX_QUADINT_ZOOM))
+    return _pack_quadint(morton, z)
+
+
 class BasicTilingBottomLeft(object):
     """BasicTilingBottomLeft is a class for representing a tiling
     scheme defined by some bounding box.  The x direction considered
@@ -84,6 +227,30 @@ class BasicTilingBottomLeft(object):
                     z=zoom)
 
 
+    def tiles(self, xcoords, ycoords, zoom):
+        """Returns the columns and rows of the tiles at the given zoom
+        level that contain each of the input coordinates.
+
+        This is the vectorized version of tile(), and gives exactly
+        the same answers for every coordinate pair.
+
+        Args:
+            xcoords: Array-like of x direction geospatial coordinates.
+            ycoords: Array-like of y direction geospatial coordinates.
+            zoom: zoom level of the tiles we want.
+
+        Returns:
+            A tuple of (x, y) int64 NumPy arrays holding the column
+            and row of the tile covering each coordinate pair.
+        """
+        xcoords = np.asarray(xcoords, dtype=np.float64)
+        ycoords = np.asarray(ycoords, dtype=np.float64)
+        scale = 2.**zoom
+        x = np.floor(scale*(xcoords - self._bounds.xmin)/(self._bounds.xmax - self._bounds.xmin))
+        y = np.floor(scale*(ycoords - self._bounds.ymin)/(self._bounds.ymax - self._bounds.ymin))
+        return x.astype(np.int64), y.astype(np.int64)
+
+
     def parent(self, *tile):
         """Returns the parent of the (x, y, z) tile.
 
@@ -181,6 +348,37 @@ class BasicTilingBottomLeft(object):
         west, north = self.ul(tile)
         east, south = self.br(tile)
         return CoordsBbox(west, south, east, north)
+
+
+    def bboxes(self, x, y, z):
+        """Returns the bounding boxes of many (x, y, z) tiles at once.
+
+        This is the vectorized version of bbox(), and gives exactly
+        the same answers for every tile.
+
+        Args:
+            x: Array-like of tile column coordinates.
+            y: Array-like of tile row coordinates.
+            z: The zoom level of the tiles, either a single level or
+               an array-like of levels.
+
+        Returns:
+            An (N, 4) float64 NumPy array whose rows are the (xmin,
+            ymin, xmax, ymax) bounding boxes of the input tiles.
+        """
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.int64),
+                                      np.asarray(y, dtype=np.int64),
+                                      np.asarray(z, dtype=np.int64))
+        scale = 2.**z
+        width = self._bounds.xmax - self._bounds.xmin
+        height = self._bounds.ymax - self._bounds.ymin
+
+        bboxes = np.empty(x.shape + (4,), dtype=np.float64)
+        bboxes[..., 0] = (x/scale*width) + self._bounds.xmin
+        bboxes[..., 2] = ((x + 1)/scale*width) + self._bounds.xmin
+        bboxes[..., 1] = (y/scale*height) + self._bounds.ymin
+        bboxes[..., 3] = ((y + 1)/scale*height) + self._bounds.ymin
+        return bboxes.reshape(-1, 4)
         
 
     def quadkey(self, *tile):
@@ -197,16 +395,7 @@ class BasicTilingBottomLeft(object):
             tile = tile[0]
         x, y, z  = [int(i) for i in tile]
         
-        quadkey = []
-        for zoom in range(z, 0, -1):
-            digit = 0
-            mask = 1 << (zoom - 1)
-            if int(x) & mask:
-                digit += 1
-            if int(y) & mask:
-                digit += 2
-            quadkey.append(digit)
-        return ''.join(str(d) for d in quadkey)
+        return _xy_to_quadkey(x, y, z)
 
 
     def quadkey_to_tile(self, qk):
@@ -221,19 +410,83 @@ class BasicTilingBottomLeft(object):
         if not qk_regex.match(qk):
             raise ValueError("Input quadkey is invalid.")
 
-        x = 0
-        y = 0
-        for i, digit in enumerate(reversed(qk)):
-            mask = 1 << i
-            if digit == '1':
-                x = x | mask
-            elif digit == '2':
-                y = y | mask
-            elif digit == '3':
-                x = x | mask
-                y = y | mask
+        x, y = _quadkey_to_xy(qk)
         return Tile(x, y, len(qk))
 
+
+    def quadint(self, *tile):
+        """Returns the quadint of the (x, y, z) tile.
+
+        A quadint packs the tile's quadkey into a 64 bit integer, see
+        quadkey_to_quadint().  Quadints sort in the same order as
+        their quadkeys.
+
+        Args:
+            *tile: A tuple of (x, y, z) tile coordinates or a Tile
+                   object we want the quadint of.
+
+        Returns:
+            The quadint of the input tile.
+        """
+        if len(tile) == 1: # Handle if a Tile object was inputted.
+            tile = tile[0]
+        x, y, z  = [int(i) for i in tile]
+        if z > MAX_QUADINT_ZOOM:
+            raise ValueError("Zoom levels above {} can't be packed into a "
+                             "quadint".format(MAX_QUADINT_ZOOM))
+        return _pack_quadint(_interleave(x, y), z)
+
+
+    def quadint_to_tile(self, qi):
+        """Returns the Tile object represented by the input quadint.
+
+        Args:
+            qi: The quadint of the tile.
+
+        Returns:
+            The Tile object represented by the input quadint.
+        """
+        morton, z = _unpack_quadint(int(qi))
+        x, y = _deinterleave(morton)
+        return Tile(x, y, z)
+
+
+    def quadints(self, x, y, z):
+        """Returns the quadints of many (x, y, z) tiles at once.
+
+        This is the vectorized version of quadint().
+
+        Args:
+            x: Array-like of tile column coordinates.
+            y: Array-like of tile row coordinates.
+            z: The zoom level of the tiles, either a single level or
+               an array-like of levels.
+
+        Returns:
+            A uint64 NumPy array of the quadints of the input tiles.
+        """
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.uint64),
+                                      np.asarray(y, dtype=np.uint64),
+                                      np.asarray(z, dtype=np.uint64))
+        return _quadints(_interleave(x, y), z)
+
+
+    def quadints_to_tiles(self, qis):
+        """Returns the tiles represented by many quadints at once.
+
+        This is the vectorized version of quadint_to_tile().
+
+        Args:
+            qis: Array-like of quadints.
+
+        Returns:
+            A tuple of (x, y, z) int64 NumPy arrays holding the tiles
+            represented by the input quadints.
+        """
+        morton, z = _unpack_quadint(np.asarray(qis, dtype=np.uint64))
+        x, y = _deinterleave(morton)
+        return x.astype(np.int64), y.astype(np.int64), z.astype(np.int64)
+
     def _xcoord(self, x, z):
         """Left geospatial coordinate of tile at given column and zoom.
 
@@ -363,6 +616,30 @@ class BasicTilingTopLeft(object):
                     z=zoom)
 
 
+    def tiles(self, xcoords, ycoords, zoom):
+        """Returns the columns and rows of the tiles at the given zoom
+        level that contain each of the input coordinates.
+
+        This is the vectorized version of tile(), and gives exactly
+        the same answers for every coordinate pair.
+
+        Args:
+            xcoords: Array-like of x direction geospatial coordinates.
+            ycoords: Array-like of y direction geospatial coordinates.
+            zoom: zoom level of the tiles we want.
+
+        Returns:
+            A tuple of (x, y) int64 NumPy arrays holding the column
+            and row of the tile covering each coordinate pair.
+        """
+        xcoords = np.asarray(xcoords, dtype=np.float64)
+        ycoords = np.asarray(ycoords, dtype=np.float64)
+        scale = 2.**zoom
+        x = np.floor(scale*(xcoords - self._bounds.xmin)/(self._bounds.xmax - self._bounds.xmin))
+        y = np.floor(scale*(self._bounds.ymax - ycoords)/(self._bounds.ymax - self._bounds.ymin))
+        return x.astype(np.int64), y.astype(np.int64)
+
+
     def parent(self, *tile):
         """Returns the parent of the (x, y, z) tile.
 
@@ -460,6 +737,37 @@ class BasicTilingTopLeft(object):
         west, north = self.ul(tile)
         east, south = self.br(tile)
         return CoordsBbox(west, south, east, north)
+
+
+    def bboxes(self, x, y, z):
+        """Returns the bounding boxes of many (x, y, z) tiles at once.
+
+        This is the vectorized version of bbox(), and gives exactly
+        the same answers for every tile.
+
+        Args:
+            x: Array-like of tile column coordinates.
+            y: Array-like of tile row coordinates.
+            z: The zoom level of the tiles, either a single level or
+               an array-like of levels.
+
+        Returns:
+            An (N, 4) float64 NumPy array whose rows are the (xmin,
+            ymin, xmax, ymax) bounding boxes of the input tiles.
+        """
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.int64),
+                                      np.asarray(y, dtype=np.int64),
+                                      np.asarray(z, dtype=np.int64))
+        scale = 2.**z
+        width = self._bounds.xmax - self._bounds.xmin
+        height = self._bounds.ymax - self._bounds.ymin
+
+        bboxes = np.empty(x.shape + (4,), dtype=np.float64)
+        bboxes[..., 0] = (x/scale*width) + self._bounds.xmin
+        bboxes[..., 2] = ((x + 1)/scale*width) + self._bounds.xmin
+        bboxes[..., 1] = self._bounds.ymax - ((y + 1)/scale*height)
+        bboxes[..., 3] = self._bounds.ymax - (y/scale*height)
+        return bboxes.reshape(-1, 4)
         
 
     def quadkey(self, *tile):
@@ -476,16 +784,7 @@ class BasicTilingTopLeft(object):
             tile = tile[0]
         x, y, z  = [int(i) for i in tile]
         
-        quadkey = []
-        for zoom in range(z, 0, -1):
-            digit = 0
-            mask = 1 << (zoom - 1)
-            if int(x) & mask:
-                digit += 1
-            if int(y) & mask:
-                digit += 2
-            quadkey.append(digit)
-        return ''.join(str(d) for d in quadkey)
+        return _xy_to_quadkey(x, y, z)
 
 
     def quadkey_to_tile(self, qk):
@@ -500,19 +799,83 @@ class BasicTilingTopLeft(object):
         if not qk_regex.match(qk):
             raise ValueError("Input quadkey is invalid.")
 
-        x = 0
-        y = 0
-        for i, digit in enumerate(reversed(qk)):
-            mask = 1 << i
-            if digit == '1':
-                x = x | mask
-            elif digit == '2':
-                y = y | mask
-            elif digit == '3':
-                x = x | mask
-                y = y | mask
+        x, y = _quadkey_to_xy(qk)
         return Tile(x, y, len(qk))
 
+
+    def quadint(self, *tile):
+        """Returns the quadint of the (x, y, z) tile.
+
+        A quadint packs the tile's quadkey into a 64 bit integer, see
+        quadkey_to_quadint().  Quadints sort in the same order as
+        their quadkeys.
+
+        Args:
+            *tile: A tuple of (x, y, z) tile coordinates or a Tile
+                   object we want the quadint of.
+
+        Returns:
+            The quadint of the input tile.
+        """
+        if len(tile) == 1: # Handle if a Tile object was inputted.
+            tile = tile[0]
+        x, y, z  = [int(i) for i in tile]
+        if z > MAX_QUADINT_ZOOM:
+            raise ValueError("Zoom levels above {} can't be packed into a "
+                             "quadint".format(MAX_QUADINT_ZOOM))
+        return _pack_quadint(_interleave(x, y), z)
+
+
+    def quadint_to_tile(self, qi):
+        """Returns the Tile object represented by the input quadint.
+
+        Args:
+            qi: The quadint of the tile.
+
+        Returns:
+            The Tile object represented by the input quadint.
+        """
+        morton, z = _unpack_quadint(int(qi))
+        x, y = _deinterleave(morton)
+        return Tile(x, y, z)
+
+
+    def quadints(self, x, y, z):
+        """Returns the quadints of many (x, y, z) tiles at once.
+
+        This is the vectorized version of quadint().
+
+        Args:
+            x: Array-like of tile column coordinates.
+            y: Array-like of tile row coordinates.
+            z: The zoom level of the tiles, either a single level or
+               an array-like of levels.
+
+        Returns:
+            A uint64 NumPy array of the quadints of the input tiles.
+        """
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.uint64),
+                                      np.asarray(y, dtype=np.uint64),
+                                      np.asarray(z, dtype=np.uint64))
+        return _quadints(_interleave(x, y), z)
+
+
+    def quadints_to_tiles(self, qis):
+        """Returns the tiles represented by many quadints at once.
+
+        This is the vectorized version of quadint_to_tile().
+
+        Args:
+            qis: Array-like of quadints.
+
+        Returns:
+            A tuple of (x, y, z) int64 NumPy arrays holding the tiles
+            represented by the input quadints.
+        """
+        morton, z = _unpack_quadint(np.asarray(qis, dtype=np.uint64))
+        x, y = _deinterleave(morton)
+        return x.astype(np.int64), y.astype(np.int64), z.astype(np.int64)
+
     def _xcoord(self, x, z):
         """Left geospatial coordinate of tile at given column and zoom.
 
@@ -660,16 +1023,8 @@ class WebMercatorBL(BasicTilingBottomLeft):
             tile = tile[0]
         x, y, z  = [int(i) for i in tile]
         
-        quadkey = []
-        for zoom in range(z, 0, -1):
-            digit = 0
-            mask = 1 << (zoom - 1)
-            if int(x) & mask:
-                digit += 1
-            if not (int(y) & mask):
-                digit += 2
-            quadkey.append(digit)
-        return ''.join(str(d) for d in quadkey)
+        # Quadkey rows count down from the top, so flip the row bits.
+        return _xy_to_quadkey(x, y ^ ((1 << z) - 1), z)
 
 
     def quadkey_to_tile(self, qk):
@@ -684,21 +1039,87 @@ class WebMercatorBL(BasicTilingBottomLeft):
         if not qk_regex.match(qk):
             raise ValueError("Input quadkey is invalid.")
 
-        x = 0
-        y = 0
-        for i, digit in enumerate(reversed(qk)):
-            mask = 1 << i
-            if digit == '1':
-                x = x | mask
-            elif digit == '2':
-                y = y | mask
-            elif digit == '3':
-                x = x | mask
-                y = y | mask
-        
+        x, y = _quadkey_to_xy(qk)
         return Tile(x, 2**len(qk) - y - 1, len(qk))
 
 
+    def quadint(self, *tile):
+        """Returns the quadint of the (x, y, z) tile.
+
+        A quadint packs the tile's quadkey into a 64 bit integer, see
+        quadkey_to_quadint().  Quadints sort in the same order as
+        their quadkeys.
+
+        Args:
+            *tile: A tuple of (x, y, z) tile coordinates or a Tile
+                   object we want the quadint of.
+
+        Returns:
+            The quadint of the input tile.
+        """
+        if len(tile) == 1: # Handle if a Tile object was inputted.
+            tile = tile[0]
+        x, y, z  = [int(i) for i in tile]
+        if z > MAX_QUADINT_ZOOM:
+            raise ValueError("Zoom levels above {} can't be packed into a "
+                             "quadint".format(MAX_QUADINT_ZOOM))
+        y = 2**z - y - 1 # Quadkey rows count down from the top.
+        return _pack_quadint(_interleave(x, y), z)
+
+
+    def quadint_to_tile(self, qi):
+        """Returns the Tile object represented by the input quadint.
+
+        Args:
+            qi: The quadint of the tile.
+
+        Returns:
+            The Tile object represented by the input quadint.
+        """
+        morton, z = _unpack_quadint(int(qi))
+        x, y = _deinterleave(morton)
+        return Tile(x, 2**z - y - 1, z)
+
+
+    def quadints(self, x, y, z):
+        """Returns the quadints of many (x, y, z) tiles at once.
+
+        This is the vectorized version of quadint().
+
+        Args:
+            x: Array-like of tile column coordinates.
+            y: Array-like of tile row coordinates.
+            z: The zoom level of the tiles, either a single level or
+               an array-like of levels.
+
+        Returns:
+            A uint64 NumPy array of the quadints of the input tiles.
+        """
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.uint64),
+                                      np.asarray(y, dtype=np.uint64),
+                                      np.asarray(z, dtype=np.uint64))
+        y = (np.uint64(1) << z) - y - np.uint64(1)
+        return _quadints(_interleave(x, y), z)
+
+
+    def quadints_to_tiles(self, qis):
+        """Returns the tiles represented by many quadints at once.
+
+        This is the vectorized version of quadint_to_tile().
+
+        Args:
+            qis: Array-like of quadints.
+
+        Returns:
+            A tuple of (x, y, z) int64 NumPy arrays holding the tiles
+            represented by the input quadints.
+        """
+        morton, z = _unpack_quadint(np.asarray(qis, dtype=np.uint64))
+        x, y = _deinterleave(morton)
+        y = (np.uint64(1) << z) - y - np.uint64(1)
+        return x.astype(np.int64), y.astype(np.int64), z.astype(np.int64)
+
+
 class WebMercator(BasicTilingTopLeft):
     """Tile scheme for Web Mercator with the tile origin in the top
     left corner.